@@ -5,7 +5,7 @@ PyCombiner — GUI-комбайн для запуска ваших проект
 Фичи:
 - Светлая/тёмная темы, Mica/тёмный титлбар (Win11), мягкий Win-стиль
 - Список проектов с тумблером "Вкл." (persist в config.json)
-- Последовательный запуск "включённых"
+- Одновременный запуск "включённых"
 - Корректный стоп: taskkill /T /F (убивает дерево)
 - Санитарная очистка зомби перед стартом проекта
 - Автозапуск PyCombiner при входе в Windows (HKCU\Run)
@@ -16,30 +16,36 @@ from __future__ import annotations
 from PySide6.QtCore import Qt
 from PySide6 import QtCore, QtGui, QtWidgets
 
-import argparse
+import contextlib
+import copy
 import faulthandler
+import functools
 import json
 import locale
+import mmap
 import os
 import platform
+import queue
 import re
 import shlex
+import signal
 import subprocess
 import sys
+import threading
 import time
 import traceback
+import types
 import uuid
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Dict, Tuple
+from typing import Iterable, List, Optional, Dict, Tuple
 ANSI_RE = re.compile(r"\x1B\[[0-?]*[ -/]*[@-~]")
 
 
 def _strip_ansi(text: str) -> str:
-    try:
-        return ANSI_RE.sub('', text)
-    except Exception:
-        return text
+    # ESC в выводе встречается редко — проверка вхождения дешевле прогона regex
+    return ANSI_RE.sub('', text) if '\x1b' in text else text
 
 
 # ------------------------ Константы/пути -----------------------------------
@@ -62,9 +68,39 @@ COMMANDS_DIR.mkdir(parents=True, exist_ok=True)
 LOG_MAX_LINES = 300
 LOG_ROTATE_MAX_BYTES = 5 * 1024 * 1024
 LOG_ROTATE_COUNT = 3
+# Сколько байт вывода процесса читаем за один заход, остальное — на следующей итерации цикла событий.
+PROC_READ_CHUNK = 64 * 1024
+# Вывод процессов копим и сбрасываем в лог не чаще, чем раз в столько мс.
+OUTPUT_FLUSH_INTERVAL_MS = 50
 PID_CACHE_TTL_SEC = 2.0
 _PID_CACHE: Dict[int, Tuple[float, bool]] = {}
+_PROC_SNAPSHOT_CACHE: Optional[Tuple[float, List[Tuple[int, int, str]]]] = None
+# снимок процессов и командные строки по PID на время пакета (см. _win_process_batch);
+# свои у каждого потока — зачистки идут и из пула, и из GUI-потока
+_PROC_BATCH = threading.local()
 PENDING_STATUS_GRACE_SEC = 3.0
+CONFIG_SAVE_DELAY_MS = 500
+ACTIVE_STATUSES = frozenset(("running", "starting", "stopping", "waiting"))
+IDLE_STATUSES = frozenset(("stopped", "crashed"))
+# цвет статуса: (светлая тема, тёмная тема)
+STATUS_COLORS = {
+    "running": ("#16a34a", "#22c55e"),
+    "starting": ("#d97706", "#f59e0b"),
+    "waiting": ("#d97706", "#f59e0b"),
+    "stopping": ("#d97706", "#f59e0b"),
+    "stopped": ("#dc2626", "#f87171"),
+    "crashed": ("#b91c1c", "#ef4444"),
+}
+# канонические (интернированные) коды статусов: уже нормализованный статус
+# распознаётся одним поиском в словаре, без strip()/lower() и новых строк
+_STATUS_CODES = {s: sys.intern(s) for s in (*ACTIVE_STATUSES, *IDLE_STATUSES)}
+
+
+def norm_status(status: Optional[str]) -> str:
+    code = _STATUS_CODES.get(status)
+    if code is not None:
+        return code
+    return (status or "").strip().lower()
 NETWORK_CHECK_INTERVAL_SEC = 10
 NETWORK_CHECK_TIMEOUT_SEC = 3
 
@@ -77,9 +113,16 @@ def ensure_dirs():
     COMMANDS_DIR.mkdir(parents=True, exist_ok=True)
 
 
+_TS_FMT = "%Y-%m-%d %H:%M:%S"
+
+
+def _ts() -> str:
+    return time.strftime(_TS_FMT)
+
+
 def log_app(message: str) -> None:
     try:
-        ts = time.strftime("%Y-%m-%d %H:%M:%S")
+        ts = _ts()
         APP_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
         with APP_LOG_PATH.open("a", encoding="utf-8") as f:
             f.write(f"[{ts}] {message}\n")
@@ -118,6 +161,27 @@ def install_debug_handlers() -> None:
         pass
 
 
+def install_quit_signals(app: QtCore.QCoreApplication, on_quit) -> None:
+    """SIGINT/SIGTERM (и Ctrl+Break на Windows) — штатное завершение через цикл событий."""
+    def _handler(signum, _frame):
+        log_app(f"Signal {signum}: shutting down")
+        QtCore.QTimer.singleShot(0, on_quit)
+
+    for name in ("SIGINT", "SIGTERM", "SIGBREAK"):
+        sig = getattr(signal, name, None)
+        if sig is None:
+            continue
+        try:
+            signal.signal(sig, _handler)
+        except (ValueError, OSError):
+            pass
+    # Python-обработчик срабатывает только между байткодами, а цикл Qt крутится в C++ —
+    # редкий пустой таймер даёт интерпретатору шанс его вызвать
+    wake = QtCore.QTimer(app)
+    wake.timeout.connect(lambda: None)
+    wake.start(500)
+
+
 def set_data_dir(path: str) -> None:
     global APPDATA_DIR, CONFIG_PATH, LOGS_DIR, STATE_PATH, COMMANDS_DIR, DAEMON_PID_PATH, APP_LOG_PATH
     if not path:
@@ -167,7 +231,11 @@ def maybe_update_env_snapshot(cfg: "Config") -> None:
     snapshot = capture_env_snapshot()
     if snapshot != current:
         cfg.data["env_snapshot"] = snapshot
-        cfg.save()
+        try:
+            cfg.save()
+        except OSError as e:
+            # не повод не запускаться: снимок уйдёт со следующей записью конфига
+            log_app(f"Config save failed: {e!r}")
 
 
 def build_process_environment(snapshot: Optional[Dict[str, str]]) -> QtCore.QProcessEnvironment:
@@ -186,6 +254,7 @@ def get_win_build() -> int:
         return 19041
 
 
+@functools.lru_cache(maxsize=1)
 def get_system_is_light() -> bool:
     try:
         import winreg
@@ -199,6 +268,7 @@ def get_system_is_light() -> bool:
         return True
 
 
+@functools.lru_cache(maxsize=1)
 def get_accent_color_argb(default: int = 0xFF2196F3) -> int:
     try:
         import winreg
@@ -209,6 +279,12 @@ def get_accent_color_argb(default: int = 0xFF2196F3) -> int:
         return default
 
 
+def invalidate_system_theme_cache() -> None:
+    """Сбросить закешированные значения реестра (тема/акцент Windows)."""
+    get_system_is_light.cache_clear()
+    get_accent_color_argb.cache_clear()
+
+
 def argb_to_qcolor(argb: int) -> QtGui.QColor:
     a = (argb >> 24) & 0xFF
     r = (argb >> 16) & 0xFF
@@ -220,22 +296,52 @@ def argb_to_qcolor(argb: int) -> QtGui.QColor:
 
 
 def decode_bytes(data: bytes) -> str:
+    # обрезанный на границе чтения или чужой байт — один «�», а не испорченный текст
     if not data:
         return ""
+    if data.isascii():
+        return data.decode("ascii")
+    return data.decode("utf-8", errors="replace")
+
+
+def decode_stream(buf: bytearray, final: bool = False) -> str:
+    """Декодирует накопленный вывод и очищает buf.
+
+    Обрезанный на границе чтения UTF-8 символ остаётся в buf до следующего куска,
+    иначе он превратился бы в «�». Дети получают PYTHONIOENCODING=utf-8.
+    """
+    if not buf:
+        return ""
     try:
-        return data.decode("utf-8", errors="replace")
-    except Exception:
-        try:
-            return data.decode(locale.getpreferredencoding(False) or "cp1251", errors="replace")
-        except Exception:
-            return data.decode("cp1251", errors="replace")
+        text = buf.decode("utf-8")
+    except UnicodeDecodeError as e:
+        if final or e.reason != "unexpected end of data" or e.end != len(buf):
+            text = buf.decode("utf-8", errors="replace")
+        else:
+            text = buf[:e.start].decode("utf-8")
+            del buf[:e.start]
+            return text
+    buf.clear()
+    return text
+
+
+def _hidden_subprocess_kwargs() -> dict:
+    if os.name != "nt":
+        return {}
+    si = subprocess.STARTUPINFO()
+    si.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    si.wShowWindow = 0  # SW_HIDE
+    return {"creationflags": subprocess.CREATE_NO_WINDOW, "startupinfo": si}
+
+
+# Служебные консольные утилиты (taskkill, schtasks, powershell...) — без окна и conhost.
+_WIN_SUBPROC_KW = _hidden_subprocess_kwargs()
 
 
 def is_network_ready() -> bool:
     if os.name != "nt":
         return True
     try:
-        flags = getattr(subprocess, "CREATE_NO_WINDOW", 0)
         ps = (
             "Get-NetIPAddress -AddressFamily IPv4 -ErrorAction SilentlyContinue "
             "| Where-Object { $_.IPAddress -notlike '169.254.*' -and $_.IPAddress -ne '127.0.0.1' } "
@@ -246,8 +352,8 @@ def is_network_ready() -> bool:
             text=True,
             encoding="utf-8",
             errors="ignore",
-            creationflags=flags,
             timeout=NETWORK_CHECK_TIMEOUT_SEC,
+            **_WIN_SUBPROC_KW,
         )
         return bool(out.strip())
     except Exception:
@@ -286,8 +392,14 @@ def enable_mica_and_titlebar(win: QtWidgets.QWidget, *, mica_light: bool, dark_t
 # ------------------------ Иконка -------------------------------------------
 
 def build_fallback_icon(size: int = 256, accent: Optional[QtGui.QColor] = None) -> QtGui.QIcon:
-    if accent is None:
-        accent = argb_to_qcolor(get_accent_color_argb())
+    argb = accent.rgba() if accent is not None else get_accent_color_argb()
+    return _render_fallback_icon(size, argb)
+
+
+@functools.lru_cache(maxsize=4)
+def _render_fallback_icon(size: int, argb: int) -> QtGui.QIcon:
+    # отрисовка через QPainter не бесплатна — один раз на (размер, акцент)
+    accent = argb_to_qcolor(argb)
     pm = QtGui.QPixmap(size, size)
     pm.fill(QtCore.Qt.transparent)
     p = QtGui.QPainter(pm)
@@ -311,20 +423,45 @@ def build_fallback_icon(size: int = 256, accent: Optional[QtGui.QColor] = None)
     return ic
 
 
+_ICON_NAMES = ("pycombiner.ico", "app.ico")
+# рядом с exe/скриптом и текущая папка на момент запуска — за сессию не меняются
+_ICON_STATIC_DIRS = (Path(sys.argv[0]).parent, Path.cwd())
+
+
+@functools.lru_cache(maxsize=2)
+def _find_app_icon_paths(data_dir: Path) -> Tuple[Path, ...]:
+    """Существующие .ico в порядке приоритета; каждый каталог читаем один раз."""
+    dirs = _ICON_STATIC_DIRS + (data_dir,)
+    listings: Dict[Path, set] = {}
+    for d in dirs:
+        if d in listings:
+            continue
+        try:
+            with os.scandir(d) as it:
+                listings[d] = {e.name.lower() for e in it}
+        except OSError:
+            listings[d] = set()
+    return tuple(
+        d / name
+        for name in _ICON_NAMES
+        for d in dirs
+        if name in listings[d]
+    )
+
+
 def load_app_icon() -> QtGui.QIcon:
-    for c in (
-        Path(sys.argv[0]).with_name("pycombiner.ico"),
-        Path.cwd() / "pycombiner.ico",
-        APPDATA_DIR / "pycombiner.ico",
-        Path(sys.argv[0]).with_name("app.ico"),
-        Path.cwd() / "app.ico",
-        APPDATA_DIR / "app.ico",
-    ):
-        if c.exists():
-            try:
-                return QtGui.QIcon(str(c))
-            except Exception:
-                pass
+    # ключ — каталог данных: --data-dir может сменить его после импорта
+    return _load_app_icon_cached(APPDATA_DIR)
+
+
+@functools.lru_cache(maxsize=2)
+def _load_app_icon_cached(data_dir: Path) -> QtGui.QIcon:
+    # QIcon разделяемый (copy-on-write): main, окно и трей получают один и тот же
+    for c in _find_app_icon_paths(data_dir):
+        try:
+            return QtGui.QIcon(str(c))
+        except Exception:
+            pass
     return build_fallback_icon()
 
 
@@ -342,6 +479,7 @@ class Lang:
     EN = "en"
 
 
+@functools.lru_cache(maxsize=1)
 def get_system_lang() -> str:
     try:
         loc = locale.getdefaultlocale()[0] or ""
@@ -350,6 +488,7 @@ def get_system_lang() -> str:
     return Lang.RU if loc.lower().startswith("ru") else Lang.EN
 
 
+@functools.lru_cache(maxsize=None)
 def resolve_lang(lang: str) -> str:
     if not lang or lang == Lang.System:
         return get_system_lang()
@@ -527,21 +666,38 @@ STATUS_LABELS = {
 }
 
 
+# Плоские таблицы по языку: английский как запасной уже подмешан.
+_STRINGS_FLAT: Dict[str, Dict[str, str]] = {
+    lang: {**STRINGS[Lang.EN], **table} for lang, table in STRINGS.items()
+}
+_STATUS_LABELS_FLAT: Dict[str, Dict[str, str]] = {
+    lang: {**STATUS_LABELS[Lang.EN], **table} for lang, table in STATUS_LABELS.items()
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _tr_cached(lang: str, key: str) -> str:
+    return _STRINGS_FLAT.get(resolve_lang(lang), _STRINGS_FLAT[Lang.EN]).get(key, key)
+
+
 def tr(lang: str, key: str, **kwargs) -> str:
-    lang = resolve_lang(lang)
-    text = STRINGS.get(lang, {}).get(key, STRINGS[Lang.EN].get(key, key))
+    text = _tr_cached(lang, key)
     return text.format(**kwargs) if kwargs else text
 
 
 def status_label(lang: str, status: str) -> str:
-    lang = resolve_lang(lang)
-    status = (status or "").strip().lower()
-    return STATUS_LABELS.get(lang, STATUS_LABELS[Lang.EN]).get(status, status)
+    status = norm_status(status)
+    return _STATUS_LABELS_FLAT.get(resolve_lang(lang), _STATUS_LABELS_FLAT[Lang.EN]).get(status, status)
 
 
 def theme_colors_hex(theme: str) -> dict:
     is_light = (theme == Theme.Light) or (
         theme == Theme.System and get_system_is_light())
+    return _theme_colors(is_light)
+
+
+@functools.lru_cache(maxsize=2)
+def _theme_colors(is_light: bool) -> dict:
     return {
         "bg":     "#f5f6f7" if is_light else "#202428",
         "card":   "#ffffff" if is_light else "#2a2e34",
@@ -552,8 +708,15 @@ def theme_colors_hex(theme: str) -> dict:
 
 
 def build_qss(theme: str, accent: QtGui.QColor) -> str:
-    cols = theme_colors_hex(theme)
-    acc = accent.name()
+    is_light = (theme == Theme.Light) or (
+        theme == Theme.System and get_system_is_light())
+    return _build_qss_cached(is_light, accent.name())
+
+
+@functools.lru_cache(maxsize=8)
+def _build_qss_cached(is_light: bool, acc: str) -> str:
+    # QColor не хешируется — ключ кеша строится из светлоты темы и #rrggbb акцента
+    cols = _theme_colors(is_light)
     return f"""
     QWidget {{ color: {cols['text']}; font-size: 13px; font-family: "Segoe UI Variable","Segoe UI"; }}
     QMainWindow {{ background: {cols['bg']}; }}
@@ -621,25 +784,313 @@ def build_qss(theme: str, accent: QtGui.QColor) -> str:
 
 def _win_taskkill_tree(pid: int):
     """Жёстко прибить процесс и всех его детей (Windows)."""
-    if not pid or pid <= 0:
+    _win_taskkill_tree_many([pid])
+
+
+def _win_taskkill_tree_many(pids: Iterable[int]):
+    """
+    То же для нескольких PID: сначала TerminateProcess по дереву из снимка
+    процессов (без запуска taskkill.exe), при неудаче — одним taskkill.
+    """
+    roots = [int(pid) for pid in pids if pid and pid > 0]
+    if not roots or _win_terminate_tree_native(roots):
         return
-    flags = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+    args = ["taskkill"]
+    for pid in roots:
+        args += ["/PID", str(pid)]
     try:
         subprocess.run(
-            ["taskkill", "/PID", str(int(pid)), "/T", "/F"],
+            args + ["/T", "/F"],
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
             check=False,
-            creationflags=flags,
+            **_WIN_SUBPROC_KW,
         )
     except Exception:
         pass
 
 
+def _win_terminate_tree_native(roots: List[int]) -> bool:
+    """
+    Убить roots и всех их потомков через TerminateProcess. Родителей гасим
+    раньше детей, чтобы они не успели породить новых. False — что-то не вышло.
+    """
+    if os.name != "nt":
+        return False
+    snap = _win_snapshot_processes(0.0)  # дерево нужно актуальное, не из кеша
+    if snap is None:
+        return False
+    children: Dict[int, List[int]] = {}
+    for pid, ppid, _exe in snap:
+        if pid != ppid:
+            children.setdefault(ppid, []).append(pid)
+    me = os.getpid()
+    order: List[int] = []
+    seen: set[int] = set()
+    pending = list(roots)
+    while pending:
+        pid = pending.pop(0)
+        if pid in seen or pid <= 4 or pid == me:
+            continue
+        seen.add(pid)
+        order.append(pid)
+        pending.extend(children.get(pid, ()))
+    try:
+        import ctypes
+        from ctypes import wintypes
+        k32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        k32.OpenProcess.restype = wintypes.HANDLE
+        k32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+        k32.TerminateProcess.argtypes = [wintypes.HANDLE, wintypes.UINT]
+        k32.CloseHandle.argtypes = [wintypes.HANDLE]
+        ok = True
+        for pid in order:
+            h = k32.OpenProcess(0x0001, False, pid)  # PROCESS_TERMINATE
+            if not h:
+                # 87 (ERROR_INVALID_PARAMETER) — процесса уже нет
+                if ctypes.get_last_error() != 87:
+                    ok = False
+                continue
+            try:
+                if not k32.TerminateProcess(h, 1):
+                    ok = False
+            finally:
+                k32.CloseHandle(h)
+        return ok
+    except Exception:
+        return False
+
+
+def _win_job_for_pid(pid: int) -> Optional[int]:
+    """
+    Job Object, в который помещён процесс pid (и все его будущие потомки), —
+    чтобы явная остановка гасила всё дерево одним TerminateJobObject.
+    KILL_ON_JOB_CLOSE не ставим: закрытие handle (естественный выход корня,
+    падение контроллера) не должно убивать пережившие его процессы —
+    «start server.exe» из .bat, обёртки cmd /c, проекты для подхвата headless.
+    Возвращает handle задания или None, если не удалось.
+    """
+    if os.name != "nt" or not pid or pid <= 0:
+        return None
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        k32 = ctypes.windll.kernel32
+        k32.CreateJobObjectW.restype = wintypes.HANDLE
+        k32.CreateJobObjectW.argtypes = [ctypes.c_void_p, wintypes.LPCWSTR]
+        k32.OpenProcess.restype = wintypes.HANDLE
+        k32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+        k32.AssignProcessToJobObject.argtypes = [wintypes.HANDLE, wintypes.HANDLE]
+        k32.CloseHandle.argtypes = [wintypes.HANDLE]
+
+        job = k32.CreateJobObjectW(None, None)
+        if not job:
+            return None
+        # PROCESS_SET_QUOTA | PROCESS_TERMINATE — минимум для AssignProcessToJobObject
+        hproc = k32.OpenProcess(0x0100 | 0x0001, False, int(pid))
+        ok = False
+        if hproc:
+            try:
+                ok = bool(k32.AssignProcessToJobObject(job, hproc))
+            finally:
+                k32.CloseHandle(hproc)
+        if not ok:
+            k32.CloseHandle(job)
+            return None
+        return int(job)
+    except Exception:
+        return None
+
+
+def _win_job_close(job: Optional[int]) -> None:
+    if not job or os.name != "nt":
+        return
+    try:
+        import ctypes
+        from ctypes import wintypes
+        k32 = ctypes.windll.kernel32
+        k32.CloseHandle.argtypes = [wintypes.HANDLE]
+        k32.CloseHandle(job)
+    except Exception:
+        pass
+
+
+def _win_job_terminate(job: Optional[int]) -> bool:
+    """Убить все процессы задания одним TerminateJobObject. False — не вышло."""
+    if not job or os.name != "nt":
+        return False
+    try:
+        import ctypes
+        from ctypes import wintypes
+        k32 = ctypes.windll.kernel32
+        k32.TerminateJobObject.argtypes = [wintypes.HANDLE, wintypes.UINT]
+        return bool(k32.TerminateJobObject(job, 1))
+    except Exception:
+        return False
+
+
+def _win_kill_tree(pid: int, job: Optional[int] = None) -> None:
+    """
+    Убить дерево процесса: одним TerminateJobObject, если процесс в нашем
+    задании, иначе — через taskkill /T.
+    """
+    if not _win_job_terminate(job):
+        _win_taskkill_tree(pid)
+
+
+def _win_snapshot_processes(max_age: float = PID_CACHE_TTL_SEC) -> Optional[List[Tuple[int, int, str]]]:
+    """
+    Список (pid, parent_pid, имя exe) через CreateToolhelp32Snapshot — без
+    запуска внешних процессов. Кешируется на max_age секунд. None — не удалось.
+    """
+    global _PROC_SNAPSHOT_CACHE
+    if os.name != "nt":
+        return None
+    now = time.monotonic()
+    if _PROC_SNAPSHOT_CACHE and (now - _PROC_SNAPSHOT_CACHE[0]) < max_age:
+        return _PROC_SNAPSHOT_CACHE[1]
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESSENTRY32W(ctypes.Structure):
+            _fields_ = [
+                ("dwSize", wintypes.DWORD),
+                ("cntUsage", wintypes.DWORD),
+                ("th32ProcessID", wintypes.DWORD),
+                ("th32DefaultHeapID", ctypes.c_size_t),
+                ("th32ModuleID", wintypes.DWORD),
+                ("cntThreads", wintypes.DWORD),
+                ("th32ParentProcessID", wintypes.DWORD),
+                ("pcPriClassBase", wintypes.LONG),
+                ("dwFlags", wintypes.DWORD),
+                ("szExeFile", wintypes.WCHAR * 260),
+            ]
+
+        k32 = ctypes.windll.kernel32
+        k32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+        k32.Process32FirstW.argtypes = [wintypes.HANDLE, ctypes.c_void_p]
+        k32.Process32NextW.argtypes = [wintypes.HANDLE, ctypes.c_void_p]
+        k32.CloseHandle.argtypes = [wintypes.HANDLE]
+        snap = k32.CreateToolhelp32Snapshot(0x00000002, 0)  # TH32CS_SNAPPROCESS
+        if not snap or snap == wintypes.HANDLE(-1).value:
+            return None
+        out: List[Tuple[int, int, str]] = []
+        try:
+            entry = PROCESSENTRY32W()
+            entry.dwSize = ctypes.sizeof(PROCESSENTRY32W)
+            ok = k32.Process32FirstW(snap, ctypes.byref(entry))
+            while ok:
+                out.append((int(entry.th32ProcessID),
+                            int(entry.th32ParentProcessID), entry.szExeFile))
+                ok = k32.Process32NextW(snap, ctypes.byref(entry))
+        finally:
+            k32.CloseHandle(snap)
+    except Exception:
+        return None
+    _PROC_SNAPSHOT_CACHE = (now, out)
+    return out
+
+
+def _win_query_command_lines(pids: Iterable[int]) -> Dict[int, str]:
+    """
+    Командные строки процессов через NtQueryInformationProcess
+    (ProcessCommandLineInformation, Win 8.1+). Недоступные процессы пропускаем.
+    """
+    out: Dict[int, str] = {}
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class UNICODE_STRING(ctypes.Structure):
+            _fields_ = [
+                ("Length", wintypes.USHORT),
+                ("MaximumLength", wintypes.USHORT),
+                ("Buffer", ctypes.c_void_p),
+            ]
+
+        k32 = ctypes.windll.kernel32
+        ntdll = ctypes.windll.ntdll
+        k32.OpenProcess.restype = wintypes.HANDLE
+        k32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+        k32.CloseHandle.argtypes = [wintypes.HANDLE]
+        ntdll.NtQueryInformationProcess.restype = ctypes.c_long
+        ntdll.NtQueryInformationProcess.argtypes = [
+            wintypes.HANDLE, ctypes.c_int, ctypes.c_void_p, wintypes.ULONG,
+            ctypes.POINTER(wintypes.ULONG)]
+    except Exception:
+        return out
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    ProcessCommandLineInformation = 60
+    for pid in pids:
+        h = k32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, int(pid))
+        if not h:
+            continue
+        try:
+            size = wintypes.ULONG(0)
+            buf = ctypes.create_string_buffer(1024)
+            status = ntdll.NtQueryInformationProcess(
+                h, ProcessCommandLineInformation, buf, len(buf), ctypes.byref(size))
+            if status != 0 and size.value > len(buf):
+                buf = ctypes.create_string_buffer(size.value)
+                status = ntdll.NtQueryInformationProcess(
+                    h, ProcessCommandLineInformation, buf, len(buf), ctypes.byref(size))
+            if status != 0:
+                continue
+            us = UNICODE_STRING.from_buffer(buf)
+            if us.Buffer and us.Length:
+                out[int(pid)] = ctypes.wstring_at(us.Buffer, us.Length // 2)
+        except Exception:
+            continue
+        finally:
+            k32.CloseHandle(h)
+    return out
+
+
+def _host_image_matcher(command: str):
+    """Предикат по имени exe, которым может исполняться команда проекта (None — неизвестно)."""
+    path = Path(command.strip().strip('"'))
+    suf = path.suffix.lower()
+    if suf == ".py":
+        return lambda name: name.startswith("py")
+    if suf == ".ps1":
+        return lambda name: name in ("powershell.exe", "pwsh.exe")
+    if suf in (".bat", ".cmd"):
+        return lambda name: name == "cmd.exe"
+    if suf == ".exe":
+        base = path.name.lower()
+        return lambda name: name == base
+    return None
+
+
+def _win_may_have_project_processes(command: str, exclude_pids: Optional[set[int]] = None) -> bool:
+    """
+    Быстрая проверка перед тяжёлым запросом CIM: есть ли вообще процесс,
+    который может принадлежать проекту. При любой неясности — True.
+    """
+    if not command:
+        return True
+    matcher = _host_image_matcher(command)
+    if matcher is None:
+        return True
+    procs = getattr(_PROC_BATCH, "procs", None) or _win_snapshot_processes()
+    if procs is None:
+        return True
+    own = os.getpid()
+    for pid, _ppid, name in procs:
+        if pid == own or (exclude_pids and pid in exclude_pids):
+            continue
+        if matcher(name.lower()):
+            return True
+    return False
+
+
 def _win_find_project_pids(command: str, work_dir: str, exclude_pids: Optional[set[int]] = None) -> List[int]:
     """
     Ищем процессы проекта по подстрокам командной строки/рабочей папки.
-    Возвращаем список PID (Windows, через PowerShell/CIM).
+    Возвращаем список PID (Windows). Процессы перечисляем сами через
+    Toolhelp/NtQueryInformationProcess; PowerShell/CIM — только запасной путь.
     """
     if platform.system() != "Windows":
         return []
@@ -650,11 +1101,87 @@ def _win_find_project_pids(command: str, work_dir: str, exclude_pids: Optional[s
         needles.append(os.path.basename(command))
     if work_dir:
         needles.append(work_dir)
-    needles = [n for n in needles if n]
+    needles = _compact_needles(needles)
 
     if not needles:
         return []
+    if not _win_may_have_project_processes(command, exclude_pids):
+        return []
+
+    pids = _win_find_project_pids_native(command, needles, exclude_pids)
+    if pids is not None:
+        return pids
+    return _win_find_project_pids_cim(needles, exclude_pids)
+
+
+def _compact_needles(needles: Iterable[str]) -> List[str]:
+    """
+    Подстроки для проверки «все входят»: выкидываем те, что уже содержатся
+    в более длинной (basename внутри полного пути), длинные — первыми,
+    чтобы несовпадение отсекалось на первом же сравнении.
+    """
+    out: List[str] = []
+    seen: List[str] = []
+    for n in sorted((n for n in needles if n), key=len, reverse=True):
+        low = n.lower()
+        if any(low in s for s in seen):
+            continue
+        seen.append(low)
+        out.append(n)
+    return out
+
 
+@contextlib.contextmanager
+def _win_process_batch():
+    """
+    Пакетный старт: все проекты внутри блока ищут свои процессы по одному
+    снимку Toolhelp, а командные строки запрашиваются не более раза на PID.
+    """
+    if getattr(_PROC_BATCH, "cmdlines", None) is not None:
+        yield
+        return
+    _PROC_BATCH.procs = _win_snapshot_processes(max_age=0)
+    _PROC_BATCH.cmdlines = {}
+    try:
+        yield
+    finally:
+        _PROC_BATCH.cmdlines = None
+        _PROC_BATCH.procs = None
+
+
+def _win_find_project_pids_native(command: str, needles: List[str], exclude_pids: Optional[set[int]] = None) -> Optional[List[int]]:
+    batch: Optional[Dict[int, str]] = getattr(_PROC_BATCH, "cmdlines", None)
+    procs = _PROC_BATCH.procs if batch is not None else _win_snapshot_processes(max_age=0)
+    if procs is None:
+        return None
+    # -like в PowerShell регистронезависим — сравниваем в нижнем регистре
+    lowered = [n.lower() for n in needles]
+    matcher = _host_image_matcher(command) if command else None
+    own = os.getpid()
+    candidates = [
+        pid for pid, _ppid, name in procs
+        if pid > 4 and pid != own
+        and not (exclude_pids and pid in exclude_pids)
+        and (matcher is None or matcher(name.lower()))
+    ]
+    if batch is not None:
+        missing = [pid for pid in candidates if pid not in batch]
+        if missing:
+            batch.update(_win_query_command_lines(missing))
+            for pid in missing:
+                batch.setdefault(pid, "")  # недоступен — не спрашиваем повторно
+        cmdlines = {pid: batch[pid] for pid in candidates}
+    else:
+        cmdlines = _win_query_command_lines(candidates)
+    pids: List[int] = []
+    for pid, cmdline in cmdlines.items():
+        cl = cmdline.lower()
+        if all(n in cl for n in lowered):
+            pids.append(pid)
+    return pids
+
+
+def _win_find_project_pids_cim(needles: List[str], exclude_pids: Optional[set[int]] = None) -> List[int]:
     # В PowerShell оборачиваем шаблон в ОДИНАРНЫЕ кавычки: '*needle*'
     # Если внутри есть одинарная кавычка — удваиваем её.
     cond_parts = []
@@ -670,14 +1197,13 @@ def _win_find_project_pids(command: str, work_dir: str, exclude_pids: Optional[s
         f"| Select-Object -ExpandProperty ProcessId"
     )
 
-    flags = getattr(subprocess, "CREATE_NO_WINDOW", 0)
     try:
         out = subprocess.check_output(
             ["powershell", "-NoProfile", "-Command", ps],
             text=True,
             encoding="utf-8",
             errors="ignore",
-            creationflags=flags,
+            **_WIN_SUBPROC_KW,
         )
     except Exception:
         out = ""
@@ -700,19 +1226,18 @@ def _win_find_project_pids(command: str, work_dir: str, exclude_pids: Optional[s
 def _win_kill_project_zombies(command: str, work_dir: str, exclude_pids: Optional[set[int]] = None):
     """
     Перед стартом пробуем найти и погасить зависшие процессы проекта
-    по подстрокам из командной строки/рабочей папки.
-    Делается через PowerShell и запрос CIM Win32_Process.
+    по подстрокам из командной строки/рабочей папки (см. _win_find_project_pids).
     """
-    for pid in _win_find_project_pids(command, work_dir, exclude_pids):
-        try:
-            _win_taskkill_tree(pid)
-        except Exception:
-            pass
+    try:
+        _win_taskkill_tree_many(
+            _win_find_project_pids(command, work_dir, exclude_pids))
+    except Exception:
+        pass
 
 
 # ------------------------ Конфиг/модель ------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class Project:
     pid: str
     name: str
@@ -733,6 +1258,8 @@ class Project:
         default=None, repr=False, compare=False, init=False)
     log: Optional["LogView"] = field(
         default=None, repr=False, compare=False, init=False)
+    tab_index: int = field(default=-1, repr=False,
+                           compare=False, init=False)
     stopping: bool = field(default=False, repr=False,
                            compare=False, init=False)
     waiting_network: bool = field(
@@ -741,6 +1268,37 @@ class Project:
         default=None, repr=False, compare=False, init=False)
     restart_pending: bool = field(
         default=False, repr=False, compare=False, init=False)
+    job_handle: Optional[int] = field(
+        default=None, repr=False, compare=False, init=False)
+    # PID запущенного процесса простым числом: опросы состояния не ходят в Qt
+    os_pid: Optional[int] = field(
+        default=None, repr=False, compare=False, init=False)
+    status_norm: str = field(default="", repr=False,
+                             compare=False, init=False)
+    args_raw: str = field(default="", repr=False, compare=False, init=False)
+    args_parsed: Optional[List[str]] = field(
+        default=None, repr=False, compare=False, init=False)
+    out_buf: bytearray = field(
+        default_factory=bytearray, repr=False, compare=False, init=False)
+
+    def __post_init__(self) -> None:
+        self.status_norm = norm_status(self.status)
+
+    def set_status(self, status: str) -> None:
+        self.status = status
+        self.status_norm = norm_status(status)
+
+    def extra_args(self) -> List[str]:
+        """Пользовательские параметры запуска; разбор кешируется до изменения args."""
+        extra = (self.args or '').strip()
+        if self.args_parsed is None or self.args_raw != extra:
+            try:
+                parsed = shlex.split(extra, posix=False) if extra else []
+            except Exception:
+                parsed = extra.split()
+            self.args_parsed = parsed
+            self.args_raw = extra
+        return self.args_parsed
 
     def to_dict(self) -> dict:
         return {
@@ -769,19 +1327,39 @@ class Project:
         )
 
 
+# путь -> ((st_mtime_ns, st_size), разобранный config.json)
+_CONFIG_CACHE: Dict[str, Tuple[Tuple[int, int], dict]] = {}
+
+
 class Config:
     def __init__(self, path: Path):
         self.path = path
         self.data: Dict[str, object] = {}
+        # последняя записанная нами версия: (текст, (mtime_ns, size) файла после записи)
+        self._written: Optional[Tuple[str, Tuple[int, int]]] = None
         self.load()
 
     def load(self):
         ensure_dirs()
-        if self.path.exists():
-            try:
-                self.data = json.loads(self.path.read_text("utf-8"))
-            except Exception:
-                self.data = {}
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            st = None
+        if st is not None:
+            key = (st.st_mtime_ns, st.st_size)
+            cached = _CONFIG_CACHE.get(str(self.path))
+            if cached and cached[0] == key:
+                self.data = copy.deepcopy(cached[1])
+            else:
+                try:
+                    self.data = json.loads(self.path.read_text("utf-8"))
+                    if not isinstance(self.data, dict):
+                        self.data = {}
+                except Exception:
+                    self.data = {}
+                else:
+                    # файл не менялся — повторный reload обойдётся без разбора JSON
+                    _CONFIG_CACHE[str(self.path)] = (key, copy.deepcopy(self.data))
         self.data.setdefault("projects", [])
         self.data.setdefault("theme", Theme.System)
         self.data.setdefault("use_mica", True)
@@ -790,17 +1368,57 @@ class Config:
         self.data.setdefault("language", Lang.System)
         self.data.setdefault("env_snapshot", {})
 
+    def _file_key(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
     def save(self):
-        ensure_dirs()
-        self.path.write_text(json.dumps(
-            self.data, ensure_ascii=False, indent=2), "utf-8")
+        self.write(self.dump())
+
+    def dump(self) -> str:
+        return json.dumps(self.data, ensure_ascii=False, indent=2)
+
+    def write(self, payload: str):
+        """Пишет готовый текст конфига; сериализацию можно сделать заранее (dump)."""
+        written = self._written
+        if written and written[0] == payload and written[1] == self._file_key():
+            return  # на диске уже ровно это, и файл с тех пор никто не трогал
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        try:
+            f = open(tmp, "w", encoding="utf-8")
+        except FileNotFoundError:
+            # каталог создаётся в load(); сюда попадаем, только если его удалили на ходу
+            ensure_dirs()
+            f = open(tmp, "w", encoding="utf-8")
+        with f:
+            f.write(payload)
+            f.flush()
+            # данные на диске до замены: после сбоя питания не останется пустого config.json
+            os.fsync(f.fileno())
+        # атомарная замена: читатель (headless) не увидит наполовину записанный файл
+        try:
+            os.replace(tmp, self.path)
+        except PermissionError:
+            # Windows: кто-то (headless в reload_config, антивирус) держит config.json
+            # открытым без FILE_SHARE_DELETE. Не ждём здесь — повтор за вызывающим
+            # (в GUI — через отложенную запись _schedule_cfg_save).
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            raise
+        key = self._file_key()
+        self._written = (payload, key) if key else None
 
     def get_projects(self) -> List[Project]:
         # type: ignore[list-item]
         projects = [Project.from_dict(p)
                     for p in self.data.get("projects", [])]
         for p in projects:
-            p.status = "stopped"
+            p.set_status("stopped")
         return projects
 
     def set_projects(self, projects: List[Project]) -> None:
@@ -808,6 +1426,28 @@ class Config:
         self.save()
 
 
+def _running_pids_and_conflict(projects: Iterable[Project], p: Project) -> Tuple[set[int], bool]:
+    """
+    За один проход: PID-ы запущенных проектов и признак, что уже бежит
+    другой проект с той же командой или рабочей папкой.
+    """
+    exclude: set[int] = set()
+    conflict = False
+    for q in projects:
+        # Starting тоже считаем: включённые проекты запускаются пачкой, без пауз
+        if not (q.process and q.process.state() != QtCore.QProcess.NotRunning):
+            continue
+        try:
+            os_pid = int(q.process.processId())
+            if os_pid:
+                exclude.add(os_pid)
+        except Exception:
+            pass
+        if q is not p and (q.cmd == p.cmd or (p.cwd and q.cwd and q.cwd == p.cwd)):
+            conflict = True
+    return exclude, conflict
+
+
 def _safe_filename(text: str) -> str:
     if not text:
         return "log"
@@ -852,13 +1492,16 @@ def _clear_log_backups(path: Path) -> None:
             pass
 
 
+def _encode_log_text(text: str) -> bytes:
+    return _strip_ansi(text).encode("utf-8", errors="replace")
+
+
 def append_project_log(p: "Project", text: str) -> None:
     if not text:
         return
-    text = _strip_ansi(text)
     try:
         path = log_path_for_project(p)
-        data = text.encode("utf-8", errors="replace")
+        data = _encode_log_text(text)
         if LOG_ROTATE_MAX_BYTES > 0:
             try:
                 size = path.stat().st_size if path.exists() else 0
@@ -874,6 +1517,112 @@ def append_project_log(p: "Project", text: str) -> None:
         pass
 
 
+class LogWriterThread(QtCore.QThread):
+    """
+    Фоновая запись логов проектов: GUI-поток только кладёт текст в очередь.
+    Файлы держим открытыми (не больше MAX_OPEN), ротация и очистка — здесь же,
+    чтобы не конфликтовать с открытыми дескрипторами и сохранить порядок записей.
+    """
+
+    MAX_OPEN = 64
+    # при непрерывном потоке очередь не пустеет — сбрасываем буферы хотя бы так часто
+    FLUSH_INTERVAL_SEC = 0.5
+    FLUSH_BYTES = 256 * 1024
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # без ограничения: put() из GUI-потока никогда не ждёт медленный диск
+        self._queue: "queue.Queue[Optional[Tuple[Path, Optional[str]]]]" = queue.Queue()
+        self._files: "OrderedDict[Path, object]" = OrderedDict()
+        self._sizes: Dict[Path, int] = {}
+
+    def append(self, path: Path, text: str) -> None:
+        if text:
+            self._queue.put((path, text))
+
+    def truncate(self, path: Path) -> None:
+        self._queue.put((path, None))
+
+    def stop(self) -> None:
+        if self.isRunning():
+            self._queue.put(None)
+            self.wait()
+
+    def run(self) -> None:
+        unflushed = 0
+        last_flush = time.monotonic()
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            path, text = item
+            try:
+                if text is None:
+                    self._truncate(path)
+                else:
+                    data = _encode_log_text(text)
+                    self._write(path, data)
+                    unflushed += len(data)
+            except Exception:
+                pass
+            now = time.monotonic()
+            if (self._queue.empty() or unflushed >= self.FLUSH_BYTES
+                    or now - last_flush >= self.FLUSH_INTERVAL_SEC):
+                self._flush_all()
+                unflushed = 0
+                last_flush = now
+        self._close_all()
+
+    def _open(self, path: Path):
+        f = self._files.pop(path, None)
+        if f is None:
+            while len(self._files) >= self.MAX_OPEN:
+                self._close(next(iter(self._files)))
+            f = path.open("ab")
+            self._sizes[path] = os.fstat(f.fileno()).st_size
+        self._files[path] = f
+        return f
+
+    def _close(self, path: Path) -> None:
+        f = self._files.pop(path, None)
+        self._sizes.pop(path, None)
+        if f is not None:
+            try:
+                f.close()
+            except Exception:
+                pass
+
+    def _write(self, path: Path, data: bytes) -> None:
+        f = self._open(path)
+        if LOG_ROTATE_MAX_BYTES > 0 and self._sizes[path] + len(data) > LOG_ROTATE_MAX_BYTES:
+            self._close(path)
+            _rotate_log_file(path)
+            if len(data) > LOG_ROTATE_MAX_BYTES:
+                data = data[-LOG_ROTATE_MAX_BYTES:]
+            f = self._open(path)
+        f.write(data)
+        self._sizes[path] += len(data)
+
+    def _truncate(self, path: Path) -> None:
+        self._close(path)
+        try:
+            path.write_text("", "utf-8")
+        except Exception:
+            pass
+        _clear_log_backups(path)
+
+    def _flush_all(self) -> None:
+        for f in self._files.values():
+            try:
+                f.flush()
+            except Exception:
+                pass
+
+    def _close_all(self) -> None:
+        for path in list(self._files):
+            self._close(path)
+
+
 def read_log_tail(path: Path, max_lines: int = LOG_MAX_LINES) -> str:
     if not path.exists():
         return ""
@@ -893,6 +1642,9 @@ def read_log_tail(path: Path, max_lines: int = LOG_MAX_LINES) -> str:
         return ""
 
 
+_LOG_READ_CHUNK = mmap.PAGESIZE * 16
+
+
 def read_log_from_offset(path: Path, offset: int) -> Tuple[str, int]:
     if not path.exists():
         return "", 0
@@ -900,15 +1652,33 @@ def read_log_from_offset(path: Path, offset: int) -> Tuple[str, int]:
         size = path.stat().st_size
         if size < offset:
             offset = 0
-        with path.open("rb") as f:
-            f.seek(offset)
-            data = f.read()
-        return decode_bytes(data), size
+        if size == offset:
+            return "", size
+        fd = os.open(str(path), os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        try:
+            if hasattr(os, "posix_fadvise"):
+                try:
+                    os.posix_fadvise(fd, offset, 0, os.POSIX_FADV_SEQUENTIAL)
+                except OSError:
+                    pass
+            os.lseek(fd, offset, os.SEEK_SET)
+            # читаем ровно до size, чтобы следующий опрос не продублировал хвост
+            parts: List[bytes] = []
+            remaining = size - offset
+            while remaining > 0:
+                chunk = os.read(fd, min(remaining, _LOG_READ_CHUNK))
+                if not chunk:
+                    break
+                parts.append(chunk)
+                remaining -= len(chunk)
+        finally:
+            os.close(fd)
+        return decode_bytes(b"".join(parts)), size - remaining
     except Exception:
         return "", offset
 
 
-def write_state(projects: List[Project]) -> None:
+def write_state(projects: Iterable[Project]) -> None:
     try:
         data = {
             "updated_at": time.time(),
@@ -922,11 +1692,7 @@ def write_state(projects: List[Project]) -> None:
                     "enabled": p.enabled,
                     "autorestart": p.autorestart,
                     "status": p.status,
-                    "os_pid": (
-                        int(p.process.processId())
-                        if p.process and p.process.state() == QtCore.QProcess.Running
-                        else (int(p.external_pid) if p.external_pid else None)
-                    ),
+                    "os_pid": p.os_pid or (int(p.external_pid) if p.external_pid else None),
                 }
                 for p in projects
             ],
@@ -957,13 +1723,12 @@ def is_pid_running(pid: int) -> bool:
     alive = False
     if os.name == "nt":
         try:
-            flags = getattr(subprocess, "CREATE_NO_WINDOW", 0)
             out = subprocess.check_output(
                 ["tasklist", "/FO", "CSV", "/NH", "/FI", f"PID eq {pid}"],
                 text=True,
                 encoding="utf-8",
                 errors="ignore",
-                creationflags=flags,
+                **_WIN_SUBPROC_KW,
             )
             if "No tasks are running" in out:
                 alive = False
@@ -1035,6 +1800,10 @@ def is_state_fresh(max_age_sec: float = 5.0) -> bool:
 
 # ------------------------ Пользовательские виджеты -------------------------
 
+# (цвет дорожки, checked, размер, dpr) -> готовая картинка тумблера
+_SWITCH_PIXMAP_CACHE: Dict[Tuple[int, bool, int, int, float], QtGui.QPixmap] = {}
+
+
 class Switch(QtWidgets.QCheckBox):
     """Win11-подобный тумблер (виджет, а не делегат)."""
 
@@ -1051,25 +1820,40 @@ class Switch(QtWidgets.QCheckBox):
         return QtCore.QSize(self._w + 8, self._h)
 
     def paintEvent(self, e: QtGui.QPaintEvent) -> None:
+        checked = self.isChecked()
+        bg = QtGui.QColor(self.accent) if checked else self.palette().mid().color()
+        dpr = self.devicePixelRatioF()
+        key = (bg.rgba(), checked, self.width(), self.height(), dpr)
+        pm = _SWITCH_PIXMAP_CACHE.get(key)
+        if pm is None:
+            pm = self._render(bg, checked, dpr)
+            _SWITCH_PIXMAP_CACHE[key] = pm
         p = QtGui.QPainter(self)
+        p.drawPixmap(0, 0, pm)
+        p.end()
+
+    def _render(self, bg: QtGui.QColor, checked: bool, dpr: float) -> QtGui.QPixmap:
+        pm = QtGui.QPixmap(self.size() * dpr)
+        pm.setDevicePixelRatio(dpr)
+        pm.fill(QtCore.Qt.transparent)
+        p = QtGui.QPainter(pm)
         p.setRenderHint(QtGui.QPainter.Antialiasing, True)
         r = self.rect().adjusted(4, 0, -4, 0)
         track = QtCore.QRectF(r.x(), r.center().y() -
                               self._h / 2, self._w, self._h)
         p.setPen(QtCore.Qt.NoPen)
-        bg = QtGui.QColor(self.accent) if self.isChecked(
-        ) else self.palette().mid().color()
-        if self.isChecked():
+        if checked:
             bg.setAlpha(220)
         p.setBrush(bg)
         p.drawRoundedRect(track, self._h / 2, self._h / 2)
         knob = self._h - 4
-        kx = track.left() + 2 if not self.isChecked() else track.right() - knob - 2
+        kx = track.left() + 2 if not checked else track.right() - knob - 2
         kr = QtCore.QRectF(kx, track.top() + 2, knob, knob)
         p.setBrush(QtGui.QColor("white"))
         p.setPen(QtGui.QPen(QtGui.QColor(0, 0, 0, 30)))
         p.drawEllipse(kr)
         p.end()
+        return pm
 
 
 class LogView(QtWidgets.QPlainTextEdit):
@@ -1095,24 +1879,82 @@ class LogView(QtWidgets.QPlainTextEdit):
 
     def append_text(self, text: str):
         text = _strip_ansi(text)
-        self.moveCursor(QtGui.QTextCursor.End)
-        self.insertPlainText(text)
-        self.moveCursor(QtGui.QTextCursor.End)
+        sb = self.verticalScrollBar()
+        at_bottom = sb.value() >= (sb.maximum() - 2)
+        if text.count("\n") >= LOG_MAX_LINES:
+            # Пачка длиннее лимита вытеснит всё текущее содержимое —
+            # раскладываем только последние LOG_MAX_LINES блоков, а не всю пачку.
+            self.setPlainText("\n".join(text.split("\n")[-LOG_MAX_LINES:]))
+        else:
+            # Вставляем отдельным курсором: без перемещения видимого курсора туда-обратно.
+            c = QtGui.QTextCursor(self.document())
+            c.movePosition(QtGui.QTextCursor.End)
+            c.insertText(text)
+        if at_bottom:
+            sb.setValue(sb.maximum())
 
 
 class StatusDelegate(QtWidgets.QStyledItemDelegate):
-    def __init__(self, color_for_status, parent=None):
+    """
+    Колонка статуса: подпись, цвет и жирность выводятся из кода статуса
+    (UserRole), так что смена статуса — одно setData на строку.
+    """
+
+    def __init__(self, color_for_status, label_for_status=None, parent=None):
         super().__init__(parent)
         self._color_for_status = color_for_status
+        self._label_for_status = label_for_status
+        # (подпись, font.key()) -> разложенный текст; подписей всего несколько
+        self._static: Dict[Tuple[str, str], QtGui.QStaticText] = {}
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        status_code = str(index.data(Qt.ItemDataRole.UserRole) or index.data() or "")
+        if self._label_for_status is not None and status_code:
+            option.text = self._label_for_status(status_code)
+        color = self._color_for_status(status_code)
+        option.palette.setColor(QtGui.QPalette.Text, color)
+        option.palette.setColor(QtGui.QPalette.HighlightedText, color)
+        option.font.setBold(True)
+
+    def _static_text(self, text: str, font: QtGui.QFont) -> QtGui.QStaticText:
+        key = (text, font.key())
+        st = self._static.get(key)
+        if st is None:
+            if len(self._static) > 64:
+                self._static.clear()
+            st = QtGui.QStaticText(text)
+            st.setTextFormat(Qt.TextFormat.PlainText)
+            st.setPerformanceHint(QtGui.QStaticText.PerformanceHint.AggressiveCaching)
+            st.prepare(QtGui.QTransform(), font)
+            self._static[key] = st
+        return st
 
     def paint(self, painter, option, index):
         opt = QtWidgets.QStyleOptionViewItem(option)
-        status_code = index.data(Qt.ItemDataRole.UserRole) or index.data()
-        color = self._color_for_status(str(status_code or ""))
-        opt.palette.setColor(QtGui.QPalette.Text, color)
-        opt.palette.setColor(QtGui.QPalette.HighlightedText, color)
-        opt.font.setBold(True)
-        super().paint(painter, opt, index)
+        self.initStyleOption(opt, index)
+        text = opt.text
+        widget = opt.widget
+        style = widget.style() if widget is not None else QtWidgets.QApplication.style()
+        margin = style.pixelMetric(QtWidgets.QStyle.PM_FocusFrameHMargin, None, widget) + 1
+        rect = style.subElementRect(
+            QtWidgets.QStyle.SE_ItemViewItemText, opt, widget).adjusted(margin, 0, -margin, 0)
+        st = self._static_text(text, opt.font) if text else None
+        if st is not None and st.size().width() > rect.width():
+            # не влезает — пусть стиль сам обрежет текст с многоточием
+            super().paint(painter, option, index)
+            return
+        # фон/выделение рисует стиль, а текст — заранее разложенным QStaticText
+        opt.text = ""
+        style.drawControl(QtWidgets.QStyle.CE_ItemViewItem, opt, painter, widget)
+        if st is None:
+            return
+        painter.save()
+        painter.setFont(opt.font)
+        painter.setPen(opt.palette.color(QtGui.QPalette.Text))
+        y = rect.y() + (rect.height() - st.size().height()) / 2
+        painter.drawStaticText(QtCore.QPointF(rect.x(), y), st)
+        painter.restore()
 
 
 # ------------------------ Автозапуск Windows Run ---------------------------
@@ -1173,17 +2015,24 @@ def set_windows_task_autostart(enable: bool, username: Optional[str] = None, pas
                 password,
             ]
         else:
+            # Без предварительного /Query: отсутствие задачи — тоже успех.
+            args = ["schtasks", "/Delete", "/TN", AUTOSTART_TASK_NAME, "/F"]
+        res = subprocess.run(args, capture_output=True, text=True, **_WIN_SUBPROC_KW)
+        ok = (res.returncode == 0)
+        msg = (res.stdout or "") + ("\n" + res.stderr if res.stderr else "")
+        if not enable and not ok:
+            err = (res.stderr or "").lower()
+            if "cannot find" in err or "не удается найти" in err:
+                return True, ""
+            # текст ошибки локализован — при незнакомом языке уточняем через /Query
             check = subprocess.run(
                 ["schtasks", "/Query", "/TN", AUTOSTART_TASK_NAME],
                 capture_output=True,
                 text=True,
+                **_WIN_SUBPROC_KW,
             )
             if check.returncode != 0:
                 return True, ""
-            args = ["schtasks", "/Delete", "/TN", AUTOSTART_TASK_NAME, "/F"]
-        res = subprocess.run(args, capture_output=True, text=True)
-        ok = (res.returncode == 0)
-        msg = (res.stdout or "") + ("\n" + res.stderr if res.stderr else "")
         if enable and ok:
             try:
                 if 'xml_path' in locals() and xml_path.exists():
@@ -1194,6 +2043,7 @@ def set_windows_task_autostart(enable: bool, username: Optional[str] = None, pas
                 ["schtasks", "/Query", "/TN", AUTOSTART_TASK_NAME],
                 capture_output=True,
                 text=True,
+                **_WIN_SUBPROC_KW,
             )
             if verify.returncode != 0:
                 return False, (msg.strip() + "\nTask verification failed.").strip()
@@ -1295,28 +2145,39 @@ def build_task_xml(command: str, arguments: str, username: str) -> str:
 
 
 def shutil_which(name: str, env: Optional[Dict[str, str]] = None) -> Optional[str]:
-    path_value = _env_lookup(env, "PATH", "")
-    for p in (path_value or "").split(os.pathsep):
-        candidate = Path(p) / name
-        if candidate.exists():
-            return str(candidate)
+    return _which_in_path(name, _env_lookup(env, "PATH", "") or "")
+
+
+@functools.lru_cache(maxsize=64)
+def _which_in_path(name: str, path_value: str) -> Optional[str]:
+    # ключ — сама строка PATH: при смене окружения кеш промахнётся сам
+    for p in path_value.split(os.pathsep):
+        candidate = os.path.join(p, name)
+        if os.path.exists(candidate):
+            return candidate
     return None
 
 
 def find_python_executable(env: Optional[Dict[str, str]] = None) -> Optional[str]:
+    # обход реестра и stat кандидатов — один раз на набор влияющих переменных
+    return _find_python_cached(
+        _env_lookup(env, "PYCOMBINER_PYTHON") or _env_lookup(env, "PYTHON_EXE"),
+        _env_lookup(env, "PATH", "") or "",
+        _env_lookup(env, "SystemRoot", r"C:\Windows"),
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _find_python_cached(env_value: str, path_value: str, sysroot: str) -> Optional[str]:
     candidates: List[Path] = []
-    env_value = _env_lookup(env, "PYCOMBINER_PYTHON")
-    if not env_value:
-        env_value = _env_lookup(env, "PYTHON_EXE")
     if env_value:
         candidates.append(Path(env_value))
     # Try PATH
     for exe in ("python.exe", "python3.exe", "py.exe"):
-        p = shutil_which(exe, env=env)
+        p = _which_in_path(exe, path_value)
         if p:
             candidates.append(Path(p))
     # Try Windows py launcher directly
-    sysroot = _env_lookup(env, "SystemRoot", r"C:\Windows")
     candidates.append(Path(sysroot) / "py.exe")
 
     # Try registry (user + machine)
@@ -1431,10 +2292,13 @@ class HeadlessController(QtCore.QObject):
         self._env_snapshot = _normalize_env_snapshot(cfg.data.get("env_snapshot"))
         if not self._env_snapshot:
             log_app("Headless: env snapshot missing, using system environment")
+        self._proc_env_template = self._build_proc_env()
         self._autostart = bool(autostart)
         self._started_at = time.time()
-        self.projects: List[Project] = cfg.get_projects()
-        enabled_count = sum(1 for p in self.projects if p.enabled)
+        # pid -> Project; порядок вставки совпадает с порядком в конфиге
+        self.projects: Dict[str, Project] = {
+            p.pid: p for p in cfg.get_projects()}
+        enabled_count = sum(1 for p in self.projects.values() if p.enabled)
         log_app(
             f"Headless: config={CONFIG_PATH} projects={len(self.projects)} enabled={enabled_count} autostart={self._autostart}"
         )
@@ -1458,19 +2322,19 @@ class HeadlessController(QtCore.QObject):
 
     def _autostart_when_network_ready(self) -> None:
         if is_network_ready():
-            for p in self.projects:
+            for p in self.projects.values():
                 if p.waiting_network:
                     p.waiting_network = False
-                    if p.status == "waiting":
-                        p.status = "stopped"
+                    if p.status_norm == "waiting":
+                        p.set_status("stopped")
             self._write_state()
             self.start_enabled()
             return
         any_waiting = False
-        for p in self.projects:
+        for p in self.projects.values():
             if p.enabled:
                 p.waiting_network = True
-                p.status = "waiting"
+                p.set_status("waiting")
                 any_waiting = True
         if any_waiting:
             log_app("Headless: waiting for network")
@@ -1479,6 +2343,13 @@ class HeadlessController(QtCore.QObject):
             NETWORK_CHECK_INTERVAL_SEC * 1000, self._autostart_when_network_ready
         )
 
+    def _build_proc_env(self) -> QtCore.QProcessEnvironment:
+        # один шаблон на снимок окружения; setProcessEnvironment копирует его сам
+        env = build_process_environment(self._env_snapshot)
+        env.insert("PYTHONIOENCODING", "utf-8")
+        env.insert("COMBINER", "1")
+        return env
+
     def _write_pid(self):
         try:
             DAEMON_PID_PATH.write_text(str(os.getpid()), "utf-8")
@@ -1497,7 +2368,7 @@ class HeadlessController(QtCore.QObject):
             pass
 
     def _write_state(self):
-        write_state(self.projects)
+        write_state(self.projects.values())
 
     def _is_stale_command(self, data: dict) -> bool:
         try:
@@ -1565,15 +2436,16 @@ class HeadlessController(QtCore.QObject):
     def reload_config(self):
         self.cfg.load()
         self._env_snapshot = _normalize_env_snapshot(self.cfg.data.get("env_snapshot"))
+        self._proc_env_template = self._build_proc_env()
         new_projects = {p.pid: p for p in self.cfg.get_projects()}
-        current = {p.pid: p for p in self.projects}
+        current = dict(self.projects)
         # stop projects removed from config
         for pid, p in list(current.items()):
             if pid not in new_projects:
                 self.stop_project(p, reason="removed_from_config")
                 current.pop(pid, None)
         # update existing and add new
-        updated: List[Project] = []
+        updated: Dict[str, Project] = {}
         for pid, np in new_projects.items():
             if pid in current:
                 cp = current[pid]
@@ -1583,36 +2455,34 @@ class HeadlessController(QtCore.QObject):
                 cp.args = np.args
                 cp.enabled = np.enabled
                 cp.autorestart = np.autorestart
-                updated.append(cp)
+                updated[pid] = cp
             else:
-                updated.append(np)
+                updated[pid] = np
         self.projects = updated
         self._write_state()
 
     def start_enabled(self):
-        enabled = [p for p in self.projects if p.enabled]
+        enabled = [p for p in self.projects.values() if p.enabled]
         log_app(f"Headless: start_enabled -> {len(enabled)} project(s)")
-        for p in self.projects:
-            if p.enabled and not (p.process and p.process.state() == QtCore.QProcess.Running):
-                self.start_project(p)
+        with _win_process_batch():
+            for p in self.projects.values():
+                if p.enabled and not (p.process and p.process.state() == QtCore.QProcess.Running):
+                    self.start_project(p)
 
     def start_project_by_pid(self, pid: str):
-        for p in self.projects:
-            if p.pid == pid:
-                self.start_project(p)
-                return
+        p = self.projects.get(pid)
+        if p:
+            self.start_project(p)
 
     def restart_project_by_pid(self, pid: str):
-        for p in self.projects:
-            if p.pid == pid:
-                self.restart_project(p)
-                return
+        p = self.projects.get(pid)
+        if p:
+            self.restart_project(p)
 
     def stop_project_by_pid(self, pid: str, reason: str = ""):
-        for p in self.projects:
-            if p.pid == pid:
-                self.stop_project(p, reason=reason or "cmd_stop")
-                return
+        p = self.projects.get(pid)
+        if p:
+            self.stop_project(p, reason=reason or "cmd_stop")
 
     def restart_project(self, p: Project) -> None:
         if p.process and p.process.state() == QtCore.QProcess.Running:
@@ -1626,7 +2496,7 @@ class HeadlessController(QtCore.QObject):
         self.start_project(p)
 
     def stop_all(self, reason: str = ""):
-        for p in self.projects:
+        for p in self.projects.values():
             self.stop_project(p, reason=reason or "stop_all")
 
     def start_project(self, p: Project):
@@ -1638,15 +2508,7 @@ class HeadlessController(QtCore.QObject):
         if p.stopping:
             return
 
-        exclude = set()
-        for q in self.projects:
-            if q.process and q.process.state() == QtCore.QProcess.Running:
-                try:
-                    exclude.add(int(q.process.processId()))
-                except Exception:
-                    pass
-        conflict_running = any((q is not p) and q.process and q.process.state() == QtCore.QProcess.Running and (
-            q.cmd == p.cmd or (p.cwd and q.cwd and q.cwd == p.cwd)) for q in self.projects)
+        exclude, conflict_running = _running_pids_and_conflict(self.projects.values(), p)
         existing_pids: List[int] = []
         if not conflict_running:
             existing_pids = _win_find_project_pids(p.cmd, p.cwd, exclude)
@@ -1654,7 +2516,7 @@ class HeadlessController(QtCore.QObject):
                 _win_kill_project_zombies(p.cmd, p.cwd, exclude)
         if existing_pids:
             p.external_pid = existing_pids[0]
-            p.status = "running"
+            p.set_status("running")
             self._write_state()
             append_project_log(
                 p,
@@ -1672,18 +2534,10 @@ class HeadlessController(QtCore.QObject):
                 pass
         env_snapshot = self._env_snapshot if self._env_snapshot else None
         program, args = program_and_args_for_cmd(p.cmd, env=env_snapshot)
-        extra = (p.args or '').strip()
-        if extra:
-            try:
-                args += shlex.split(extra, posix=False)
-            except Exception:
-                args += extra.split()
+        args += p.extra_args()
 
         proc = QtCore.QProcess(self)
-        env = build_process_environment(self._env_snapshot)
-        env.insert("PYTHONIOENCODING", "utf-8")
-        env.insert("COMBINER", "1")
-        proc.setProcessEnvironment(env)
+        proc.setProcessEnvironment(self._proc_env_template)
         proc.setProgram(program)
         proc.setArguments(args)
         if p.cwd:
@@ -1691,19 +2545,16 @@ class HeadlessController(QtCore.QObject):
         proc.setProcessChannelMode(QtCore.QProcess.MergedChannels)
         log_app(f"Headless: start {p.name} -> {program} {args} cwd={p.cwd}")
 
-        proc.readyReadStandardOutput.connect(
-            lambda p_=p, pr=proc: self._on_proc_output(p_, pr))
-        proc.readyReadStandardError.connect(
-            lambda p_=p, pr=proc: self._on_proc_output(p_, pr))
-        proc.finished.connect(lambda code, status,
-                              p_=p, pr=proc: self._on_proc_finished(p_, pr, code, status))
-        proc.errorOccurred.connect(
-            lambda err, p_=p, pr=proc: self._on_proc_error(p_, pr, err))
-        proc.started.connect(lambda p_=p: self._on_proc_started(p_))
+        on_output = functools.partial(self._on_proc_output, p, proc)
+        proc.readyReadStandardOutput.connect(on_output)
+        proc.readyReadStandardError.connect(on_output)
+        proc.finished.connect(functools.partial(self._on_proc_finished, p, proc))
+        proc.errorOccurred.connect(functools.partial(self._on_proc_error, p, proc))
+        proc.started.connect(functools.partial(self._on_proc_started, p))
 
         p.stopping = False
         p.external_pid = None
-        p.status = "starting"
+        p.set_status("starting")
         self._write_state()
         try:
             proc.start()
@@ -1711,7 +2562,7 @@ class HeadlessController(QtCore.QObject):
             log_app(f"Headless: start failed {p.name}: {e}")
             append_project_log(p, self._format_log(
                 self._tr("log_start_error", err=e)))
-            p.status = "stopped"
+            p.set_status("stopped")
             self._write_state()
             return
 
@@ -1727,15 +2578,15 @@ class HeadlessController(QtCore.QObject):
         p.waiting_network = False
         if p.process and p.process.state() == QtCore.QProcess.Running:
             p.stopping = True
-            p.status = "stopping"
+            p.set_status("stopping")
             self._write_state()
             pid = int(p.process.processId() or 0)
             try:
                 p.process.terminate()
                 if not p.process.waitForFinished(1500):
-                    _win_taskkill_tree(pid)
+                    _win_kill_tree(pid, p.job_handle)
             except Exception:
-                _win_taskkill_tree(pid)
+                _win_kill_tree(pid, p.job_handle)
         else:
             if p.external_pid and is_pid_running(int(p.external_pid)):
                 try:
@@ -1744,25 +2595,32 @@ class HeadlessController(QtCore.QObject):
                     pass
             else:
                 _win_kill_project_zombies(p.cmd, p.cwd)
-            p.status = "stopped"
+            p.set_status("stopped")
             p.external_pid = None
             self._write_state()
         append_project_log(p, self._format_log(self._tr("log_stop")))
 
     def _on_proc_output(self, p: Project, pr: QtCore.QProcess):
-        data = pr.readAll().data()
-        text = decode_bytes(data)
+        p.out_buf += pr.readAll().data()
+        text = decode_stream(p.out_buf)
         if text:
             append_project_log(p, text)
 
     def _on_proc_started(self, p: Project):
-        p.status = "running"
+        if p.process is not None:
+            p.os_pid = int(p.process.processId() or 0) or None
+            _win_job_close(p.job_handle)
+            p.job_handle = _win_job_for_pid(p.os_pid or 0)
+        p.set_status("running")
         p.external_pid = None
         p.waiting_network = False
         self._write_state()
         log_app(f"Headless: running {p.name}")
 
     def _on_proc_finished(self, p: Project, pr: QtCore.QProcess, code: int, status: QtCore.QProcess.ExitStatus):
+        tail = decode_stream(p.out_buf, final=True)
+        if tail:
+            append_project_log(p, tail)
         append_project_log(
             p,
             self._format_log(self._tr(
@@ -1775,12 +2633,15 @@ class HeadlessController(QtCore.QObject):
         if p.process is not pr:
             return
         was_stopping = p.stopping
-        p.status = "stopped" if (was_stopping or (status == QtCore.QProcess.NormalExit and code == 0)) else "crashed"
+        p.set_status("stopped" if (was_stopping or (status == QtCore.QProcess.NormalExit and code == 0)) else "crashed")
         self._write_state()
 
         pr_autorestart = (
             p.autorestart and not was_stopping and status == QtCore.QProcess.CrashExit)
         p.process = None
+        p.os_pid = None
+        _win_job_close(p.job_handle)
+        p.job_handle = None
         p.external_pid = None
         if p.stopping:
             p.stopping = False
@@ -1793,10 +2654,10 @@ class HeadlessController(QtCore.QObject):
                     _clear_log_backups(path)
                 except Exception:
                     pass
-            QtCore.QTimer.singleShot(300, lambda: self.start_project(p))
+            QtCore.QTimer.singleShot(300, functools.partial(self.start_project, p))
             return
         if pr_autorestart:
-            QtCore.QTimer.singleShot(2000, lambda: self.start_project(p))
+            QtCore.QTimer.singleShot(2000, functools.partial(self.start_project, p))
 
     def _on_proc_error(self, p: Project, pr: QtCore.QProcess, err: QtCore.QProcess.ProcessError):
         if p.process is not pr:
@@ -1806,7 +2667,7 @@ class HeadlessController(QtCore.QObject):
         self._write_state()
 
     def _format_log(self, text: str) -> str:
-        return f"[{QtCore.QDateTime.currentDateTime().toString('yyyy-MM-dd hh:mm:ss')}] {text}\n"
+        return f"[{_ts()}] {text}\n"
 
     def _tr(self, key: str, **kwargs) -> str:
         return tr(self._language, key, **kwargs)
@@ -1814,27 +2675,67 @@ class HeadlessController(QtCore.QObject):
 
 # ------------------------ Главное окно -------------------------------------
 
+class _BulkStartSignals(QtCore.QObject):
+    # из потока пула в GUI-поток: зачистка зомби перед пакетным стартом закончена
+    swept = QtCore.Signal()
+
+
 class MainWindow(QtWidgets.QMainWindow):
     def __init__(self, cfg: Config):
         super().__init__()
         self.cfg = cfg
         self.projects: List[Project] = cfg.get_projects()
-        self._start_enabled_queue: List[Project] = []
         self._theme = self.cfg.data.get("theme", Theme.System)
+        self._is_light = (self._theme == Theme.Light) or (
+            self._theme == Theme.System and get_system_is_light())
+        self._status_color_cache: Dict[str, QtGui.QColor] = self._status_palette()
+        self._status_label_cache: Dict[str, str] = {}
+        self._theme_applied: Optional[Tuple[str, int, bool, bool]] = None
         self._accent = argb_to_qcolor(get_accent_color_argb())
         self._language = self.cfg.data.get("language", Lang.System)
-        self._syncing_selection = False
-        self._syncing_autostart_task = False
+        self._bind_strings()
         self._client_mode = self._should_use_client_mode()
         self._log_offsets: Dict[str, int] = {}
         self._pending_actions: Dict[str, Tuple[str, float]] = {}
         self._last_headless_spawn = 0.0
+        # Последние применённые стили: не трогаем виджеты, если ничего не поменялось.
+        self._daemon_last: Optional[Tuple[str, str]] = None
+        self._tab_colors: Dict[str, str] = {}
+        self._headless_env = self._build_headless_env()
+        # Окружение дочерних процессов: один раз, setProcessEnvironment копирует его сам.
+        self._proc_env_template = QtCore.QProcessEnvironment.systemEnvironment()
+        self._proc_env_template.insert("PYTHONIOENCODING", "utf-8")
+        self._proc_env_template.insert("COMBINER", "1")
+        self._cfg_save_pending = False
+        self._cfg_projects_dirty = False
+        self._cfg_reload_pending = False
+        self._dirty_output: Dict[str, Project] = {}
+        self._tab_sync_queued = False
+        self._pid_index: Dict[str, Project] = {}
+        self._log_writer = LogWriterThread(self)
+        self._log_writer.start()
+        self._thread_pool = QtCore.QThreadPool(self)
+        self._bulk_start_targets: List[Project] = []
+        self._bulk_start_signals = _BulkStartSignals(self)
+        self._bulk_start_signals.swept.connect(self._on_bulk_sweep_done)
+        self._output_timer = QtCore.QTimer(self)
+        self._output_timer.setSingleShot(True)
+        self._output_timer.setInterval(OUTPUT_FLUSH_INTERVAL_MS)
+        self._output_timer.timeout.connect(self._flush_all_output)
 
         self.setWindowTitle(f"{APP_NAME} v{APP_VERSION}")
-        self.setWindowIcon(load_app_icon())
+        # прошлая геометрия окна; если восстановилась — центрировать при показе незачем
+        self._centered_once = self._restore_geometry()
+        if not self._centered_once:
+            self.resize(1200, 800)
 
         self._really_quit = False
-        self._build_tray()
+        self.tray: Optional[QtWidgets.QSystemTrayIcon] = None
+        self._closing = False
+        self._tray_available = False
+        self._dlg_project: Optional[ProjectDialog] = None
+        self._tray_strings: Optional[Dict[str, str]] = None  # таблица, с которой подписан трей
+        QtCore.QTimer.singleShot(0, self._deferred_icon)
         self._build_ui()
         self._populate_projects()
         self.apply_language()
@@ -1852,8 +2753,8 @@ class MainWindow(QtWidgets.QMainWindow):
             self._daemon_watch_timer = QtCore.QTimer(self)
             self._daemon_watch_timer.timeout.connect(self._monitor_daemon)
             self._daemon_watch_timer.start(1500)
-        else:
-            QtCore.QTimer.singleShot(300, self.on_start_enabled)
+        # автостарт включённых — из showEvent, как только окно показано
+        self._started_once = self._client_mode
 
     def _should_use_client_mode(self) -> bool:
         if is_daemon_running():
@@ -1869,17 +2770,19 @@ class MainWindow(QtWidgets.QMainWindow):
             self._refresh_state_from_file()
         self._update_daemon_indicator()
 
+    @staticmethod
+    def _build_headless_env() -> Dict[str, str]:
+        # Drop PyInstaller/Qt injection from GUI so headless starts clean.
+        skip = ("QT_PLUGIN_PATH", "QML2_IMPORT_PATH", "PYTHONPATH", "PYTHONHOME")
+        return {
+            k: v for k, v in os.environ.items()
+            if not k.startswith("_PYI_") and k not in skip
+        }
+
     def _spawn_headless(self) -> bool:
         try:
             cmd, args = get_self_run_parts(
                 headless=True, data_dir=APPDATA_DIR, autostart=True)
-            env = dict(os.environ)
-            # Drop PyInstaller/Qt injection from GUI so headless starts clean.
-            for k in list(env.keys()):
-                if k.startswith("_PYI_"):
-                    env.pop(k, None)
-            for k in ("QT_PLUGIN_PATH", "QML2_IMPORT_PATH", "PYTHONPATH", "PYTHONHOME"):
-                env.pop(k, None)
             flags = 0
             if os.name == "nt":
                 flags |= getattr(subprocess, "CREATE_NO_WINDOW", 0)
@@ -1890,7 +2793,7 @@ class MainWindow(QtWidgets.QMainWindow):
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
                 creationflags=flags,
-                env=env,
+                env=self._headless_env,
             )
             log_app("GUI: spawned headless controller")
             return True
@@ -1920,6 +2823,9 @@ class MainWindow(QtWidgets.QMainWindow):
         else:
             text = self._tr("headless_disconnected")
             color = self._status_color("stopped").name()
+        if self._daemon_last == (text, color):
+            return
+        self._daemon_last = (text, color)
         self.lbl_daemon.setText(text)
         self.lbl_daemon.setStyleSheet(f"color: {color}; font-weight: 600;")
     # ---------- UI ----------
@@ -1966,7 +2872,8 @@ class MainWindow(QtWidgets.QMainWindow):
         self.tree.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
         self.tree.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
         self.tree.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
-        self._status_delegate = StatusDelegate(self._status_color, self.tree)
+        self._status_delegate = StatusDelegate(
+            self._status_color, self._status_label, self.tree)
         self.tree.setItemDelegateForColumn(2, self._status_delegate)
         main.addWidget(self.tree, 1)
 
@@ -2035,8 +2942,16 @@ class MainWindow(QtWidgets.QMainWindow):
         self.act_theme_system = self.menu_appearance.addAction("")
         self.act_theme_light = self.menu_appearance.addAction("")
         self.act_theme_dark = self.menu_appearance.addAction("")
+        theme_group = QtGui.QActionGroup(self.menu_appearance)
+        theme_group.setExclusive(True)
         for a in (self.act_theme_system, self.act_theme_light, self.act_theme_dark):
             a.setCheckable(True)
+            theme_group.addAction(a)
+        self._theme_actions = {
+            Theme.System: self.act_theme_system,
+            Theme.Light: self.act_theme_light,
+            Theme.Dark: self.act_theme_dark,
+        }
         self.act_theme_system.triggered.connect(
             lambda: self.set_theme(Theme.System))
         self.act_theme_light .triggered.connect(
@@ -2048,7 +2963,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.act_use_mica = self.menu_appearance.addAction("")
         self.act_use_mica.setCheckable(True)
         self.act_use_mica.setChecked(bool(self.cfg.data.get("use_mica", True)))
-        self.act_use_mica.triggered.connect(self.apply_theme)
+        self.act_use_mica.triggered.connect(self._on_use_mica_toggled)
 
         self.menu_language = mb.addMenu("")
         self.act_lang_system = self.menu_language.addAction("")
@@ -2068,59 +2983,113 @@ class MainWindow(QtWidgets.QMainWindow):
         self.menu_help = mb.addMenu("")
         self.act_about = self.menu_help.addAction("", self.on_about)
 
+    def _schedule_cfg_save(self, *, projects: bool = False, reload: bool = False) -> None:
+        # сохраняем конфиг не чаще раза в CONFIG_SAVE_DELAY_MS;
+        # projects — пересобрать список проектов, reload — потом оповестить headless
+        self._cfg_projects_dirty |= projects
+        self._cfg_reload_pending |= reload
+        if self._cfg_save_pending or self._closing:
+            return  # при выходе конфиг пишет closeEvent (в standalone — из пула)
+        self._cfg_save_pending = True
+        QtCore.QTimer.singleShot(CONFIG_SAVE_DELAY_MS, self._do_cfg_save)
+
+    def _do_cfg_save(self) -> None:
+        if not self._cfg_save_pending:
+            return
+        self._cfg_save_pending = False
+        projects_dirty, self._cfg_projects_dirty = self._cfg_projects_dirty, False
+        try:
+            if projects_dirty:
+                self.cfg.set_projects(self.projects)
+            else:
+                self.cfg.save()
+        except Exception as e:
+            log_app(f"Config save failed: {e!r}")
+            # изменения не теряем: следующая отложенная запись повторит попытку
+            self._schedule_cfg_save(projects=projects_dirty)
+            return
+        if self._cfg_reload_pending:
+            self._cfg_reload_pending = False
+            if self._client_mode:
+                self._send_command("reload")
+
     def set_theme(self, theme: str):
         self.cfg.data["theme"] = theme
-        self.cfg.save()
+        self._schedule_cfg_save()
+        invalidate_system_theme_cache()
         self.apply_theme()
 
     def set_language(self, lang: str):
         self._language = lang
+        self._bind_strings()
         self.cfg.data["language"] = lang
-        self.cfg.save()
+        self._schedule_cfg_save()
         self.apply_language()
 
     def _lang(self) -> str:
         return resolve_lang(self._language)
 
+    def _bind_strings(self) -> None:
+        # язык резолвим один раз — дальше _tr/_status_label это одно обращение к dict
+        lang = resolve_lang(self._language)
+        self._strings = _STRINGS_FLAT.get(lang, _STRINGS_FLAT[Lang.EN])
+        self._status_labels = _STATUS_LABELS_FLAT.get(lang, _STATUS_LABELS_FLAT[Lang.EN])
+        self._status_label_cache = {}
+
     def _tr(self, key: str, **kwargs) -> str:
-        return tr(self._language, key, **kwargs)
+        text = self._strings.get(key, key)
+        return text.format(**kwargs) if kwargs else text
+
+    def _on_use_mica_toggled(self, checked: bool) -> None:
+        self.cfg.data["use_mica"] = bool(checked)
+        self._schedule_cfg_save()
+        self.apply_theme()
 
     def apply_theme(self):
         # type: ignore[assignment]
         theme = self.cfg.data.get("theme", Theme.System)
         is_light = (theme == Theme.Light) or (
             theme == Theme.System and get_system_is_light())
-        accent = argb_to_qcolor(get_accent_color_argb())
-        self._theme = theme
-        self._accent = accent
-
-        self.setStyleSheet(build_qss(theme, accent))
+        argb = get_accent_color_argb()
+        use_mica = bool(self.cfg.data.get("use_mica", True))
 
-        # Заголовок/фон окна
-        if self.cfg.data.get("use_mica", True) and is_light and get_win_build() >= 22000:
+        # Заголовок/фон окна — дёшево и нужно и после показа окна (повторный вызов из __init__)
+        if use_mica and is_light and get_win_build() >= 22000:
             enable_mica_and_titlebar(self, mica_light=True, dark_title=False)
         else:
             enable_mica_and_titlebar(
                 self, mica_light=False, dark_title=not is_light)
 
-        # Логи перекрасить (важно для старта в тёмной теме)
-        for log in self.findChildren(LogView):
-            log.apply_palette(theme, accent)
+        key = (theme, argb, is_light, use_mica)
+        if key == self._theme_applied:
+            return  # стили уже такие — не перестилизовываем всё приложение
+        self._theme_applied = key
+        accent = argb_to_qcolor(argb)
+        self._theme = theme
+        self._accent = accent
+        self._is_light = is_light
+        self._status_color_cache = self._status_palette()
+
+        self.setStyleSheet(build_qss(theme, accent))
 
-        # обновим цвет акцента у тумблеров
         for p in self.projects:
+            # Логи перекрасить (важно для старта в тёмной теме); LogView есть только у p.log
+            if p.log:
+                p.log.apply_palette(theme, accent)
+            # обновим цвет акцента у тумблеров
             if p.switch:
                 p.switch.accent = accent
                 p.switch.update()
-            self._apply_status_style(p)
             self._apply_tab_status(p)
+        # цвета статусов зависят от темы — делегат перечитает их при отрисовке
+        self.tree.viewport().update()
         self._update_daemon_indicator()
 
-        # обновить состояние меню
-        self.act_theme_system.setChecked(theme == Theme.System)
-        self.act_theme_light .setChecked(theme == Theme.Light)
-        self.act_theme_dark  .setChecked(theme == Theme.Dark)
-        self.act_use_mica.setChecked(bool(self.cfg.data.get("use_mica", True)))
+        # обновить состояние меню (группа эксклюзивная — достаточно отметить один пункт)
+        act = self._theme_actions.get(theme)
+        if act is not None:
+            act.setChecked(True)
+        self.act_use_mica.setChecked(use_mica)
 
     def apply_language(self):
         # Кнопки
@@ -2173,59 +3142,68 @@ class MainWindow(QtWidgets.QMainWindow):
         self.act_lang_en.setChecked(self._language == Lang.EN)
 
         # Трей
-        if getattr(self, "tray", None):
-            if getattr(self, "act_tray_show", None):
-                self.act_tray_show.setText(self._tr("tray_show"))
-            if getattr(self, "act_tray_start_enabled", None):
-                self.act_tray_start_enabled.setText(
-                    self._tr("tray_start_enabled"))
-            if getattr(self, "act_tray_exit", None):
-                self.act_tray_exit.setText(self._tr("tray_exit"))
-
-        # Обновим подписи статусов
-        for p in self.projects:
-            if p.item:
-                p.item.setText(2, self._status_label(p.status))
-                p.item.setData(2, Qt.ItemDataRole.UserRole, p.status)
+        self._apply_tray_texts()
+
+        # Подписи статусов рисует делегат — достаточно перерисовать
         self.tree.viewport().update()
 
     def _status_label(self, status: str) -> str:
-        return status_label(self._language, status)
+        label = self._status_label_cache.get(status)
+        if label is None:
+            norm = norm_status(status)
+            label = self._status_label_cache[status] = self._status_labels.get(norm, norm)
+        return label
 
     def _status_color(self, status: str) -> QtGui.QColor:
-        status = (status or "").strip().lower()
-        theme = self._theme
-        is_light = (theme == Theme.Light) or (
-            theme == Theme.System and get_system_is_light())
-        palette = {
-            "running": "#16a34a" if is_light else "#22c55e",
-            "starting": "#d97706" if is_light else "#f59e0b",
-            "waiting": "#d97706" if is_light else "#f59e0b",
-            "stopping": "#d97706" if is_light else "#f59e0b",
-            "stopped": "#dc2626" if is_light else "#f87171",
-            "crashed": "#b91c1c" if is_light else "#ef4444",
-        }
-        return QtGui.QColor(palette.get(status, self._accent.name()))
-
-    def _apply_status_style(self, p: Project) -> None:
-        if not p.item:
-            return
-        p.item.setForeground(2, QtGui.QBrush(self._status_color(p.status)))
-        font = p.item.font(2)
-        font.setBold(True)
-        p.item.setFont(2, font)
+        # делегат зовёт это на каждую отрисовку строки; известные статусы уже в кеше
+        color = self._status_color_cache.get(status)
+        if color is None:
+            color = self._status_color_cache[status] = self._make_status_color(status)
+        return color
+
+    def _status_palette(self) -> Dict[str, QtGui.QColor]:
+        """Цвета всех известных статусов для текущей темы — считаются раз на смену темы."""
+        i = 0 if self._is_light else 1
+        return {status: QtGui.QColor(hexes[i]) for status, hexes in STATUS_COLORS.items()}
+
+    def _make_status_color(self, status: str) -> QtGui.QColor:
+        color = self._status_color_cache.get(norm_status(status))
+        return QtGui.QColor(color if color is not None else self._accent)
+
+    def _ensure_log(self, p: Project) -> Optional[LogView]:
+        """Настоящий LogView вместо заглушки на вкладке проекта."""
+        if p.log is not None or p.tab_index < 0:
+            return p.log
+        te = LogView(theme=self._theme, accent=self._accent, parent=self.tabs)
+        idx = p.tab_index
+        with QtCore.QSignalBlocker(self.tabs):
+            cur = self.tabs.currentIndex()
+            placeholder = self.tabs.widget(idx)
+            self.tabs.removeTab(idx)
+            self.tabs.insertTab(idx, te, p.name)
+            self.tabs.setCurrentIndex(cur)
+        if placeholder is not None:
+            placeholder.deleteLater()
+        p.log = te
+        self._tab_colors.pop(p.pid, None)
+        self._apply_tab_status(p)
+        if self._client_mode:
+            self._load_log_tail(p)
+        return te
 
     def _apply_tab_status(self, p: Project) -> None:
-        if not p.log:
-            return
-        idx = self.tabs.indexOf(p.log)
+        idx = p.tab_index
         if idx < 0:
             return
-        if (p.status or "").strip().lower() == "crashed":
-            self.tabs.tabBar().setTabTextColor(
-                idx, self._status_color(p.status))
+        if p.status_norm == "crashed":
+            color = self._status_color(p.status)
         else:
-            self.tabs.tabBar().setTabTextColor(idx, QtGui.QColor())
+            color = QtGui.QColor()
+        key = color.name() if color.isValid() else ""
+        if self._tab_colors.get(p.pid) == key:
+            return
+        self._tab_colors[p.pid] = key
+        self.tabs.tabBar().setTabTextColor(idx, color)
 
     def _project_by_tab_index(self, index: int) -> Optional[Project]:
         if index < 0 or index >= len(self.projects):
@@ -2249,15 +3227,13 @@ class MainWindow(QtWidgets.QMainWindow):
         except Exception:
             self._log_offsets[p.pid] = 0
 
+    def _append_log_file(self, p: Project, text: str) -> None:
+        self._log_writer.append(log_path_for_project(p), text)
+
     def _clear_log_for_project(self, p: Project) -> None:
         if p.log:
             p.log.clear()
-        path = log_path_for_project(p)
-        try:
-            path.write_text("", "utf-8")
-        except Exception:
-            pass
-        _clear_log_backups(path)
+        self._log_writer.truncate(log_path_for_project(p))
         self._log_offsets[p.pid] = 0
 
     def _poll_log_updates(self) -> None:
@@ -2293,12 +3269,13 @@ class MainWindow(QtWidgets.QMainWindow):
             new_status = sp.get("status", p.status)
             if self._should_ignore_status_update(p, new_status):
                 continue
-            if new_status != p.status:
-                p.status = new_status
-                self._update_row_status(p)
+            self._set_status(p, new_status)
         self._update_daemon_indicator()
 
     def _send_command(self, action: str, pid: Optional[str] = None) -> None:
+        if self._cfg_reload_pending and action != "reload":
+            # отложенные правки должны дойти до headless раньше команды
+            self._do_cfg_save()
         ensure_dirs()
         payload = {
             "id": uuid.uuid4().hex,
@@ -2328,58 +3305,53 @@ class MainWindow(QtWidgets.QMainWindow):
     def _populate_projects(self):
         self.tree.clear()
         self.tabs.clear()
-        # type: ignore[assignment]
-        theme = self.cfg.data.get("theme", Theme.System)
-        accent = argb_to_qcolor(get_accent_color_argb())
+        self._tab_colors.clear()
+        self._pid_index = {}
 
         for p in self.projects:
-            item = QtWidgets.QTreeWidgetItem()
-            item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-            item.setText(1, p.name)
-            item.setText(2, self._status_label(p.status))
-            item.setData(2, Qt.ItemDataRole.UserRole, p.status)
-            item.setText(3, p.cmd)
-            item.setText(4, p.cwd)
-            item.setData(0, Qt.ItemDataRole.UserRole, p.pid)
-            self.tree.addTopLevelItem(item)
-            p.item = item
-            self._apply_status_style(p)
-
-            sw = Switch(accent, self.tree)
-            sw.setChecked(p.enabled)
-            sw.toggled.connect(
-                lambda checked, proj=p: self._on_switch_toggled(proj, checked))
-            self.tree.setItemWidget(item, 0, sw)
-            p.switch = sw
-
-            te = LogView(theme=theme, accent=accent, parent=self.tabs)
-            self.tabs.addTab(te, p.name)
-            p.log = te
-            self._apply_tab_status(p)
-            self._log_offsets[p.pid] = 0
-            if self._client_mode:
-                self._load_log_tail(p)
+            self._append_project_row(p)
 
         if self.tree.topLevelItemCount() > 0:
             self.tree.setCurrentItem(self.tree.topLevelItem(0))
             self.tabs.setCurrentIndex(0)
         self._refresh_action_buttons()
 
+    def _append_project_row(self, p: Project) -> None:
+        """Строка в списке, тумблер и вкладка лога для одного (последнего) проекта."""
+        item = QtWidgets.QTreeWidgetItem()
+        item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
+        item.setText(1, p.name)
+        item.setData(2, Qt.ItemDataRole.UserRole, p.status)
+        item.setText(3, p.cmd)
+        item.setText(4, p.cwd)
+        item.setData(0, Qt.ItemDataRole.UserRole, p.pid)
+        self.tree.addTopLevelItem(item)
+        p.item = item
+
+        sw = Switch(self._accent, self.tree)
+        sw.setChecked(p.enabled)
+        sw.toggled.connect(
+            lambda checked, proj=p: self._on_switch_toggled(proj, checked))
+        self.tree.setItemWidget(item, 0, sw)
+        p.switch = sw
+
+        # LogView создаётся при первом показе вкладки или первом выводе (_ensure_log)
+        p.log = None
+        p.tab_index = self.tabs.addTab(QtWidgets.QWidget(self.tabs), p.name)
+        self._pid_index[p.pid] = p
+        self._apply_tab_status(p)
+        self._log_offsets[p.pid] = 0
+
     def _on_switch_toggled(self, p: Project, checked: bool) -> None:
         p.enabled = checked
-        self.cfg.set_projects(self.projects)
-        if self._client_mode:
-            self._send_command("reload")
+        # пачка переключений — одна запись конфига и один reload
+        self._schedule_cfg_save(projects=True, reload=self._client_mode)
 
     def _selected_project(self) -> Optional[Project]:
         it = self.tree.currentItem()
         if not it:
             return None
-        pid = it.data(0, Qt.ItemDataRole.UserRole)
-        for p in self.projects:
-            if p.pid == pid:
-                return p
-        return None
+        return self._pid_index.get(it.data(0, Qt.ItemDataRole.UserRole))
 
     def _refresh_action_buttons(self) -> None:
         p = self._selected_project()
@@ -2390,38 +3362,40 @@ class MainWindow(QtWidgets.QMainWindow):
             self.btn_stop_all.setEnabled(False)
             return
 
-        status = (p.status or "").strip().lower()
-        can_start = status in ("stopped", "crashed")
-        can_stop = status in ("running", "starting", "stopping", "waiting")
+        status = p.status_norm
+        can_start = status in IDLE_STATUSES
+        can_stop = status in ACTIVE_STATUSES
         can_restart = status in ("running", "starting", "stopped", "crashed")
 
         self.btn_start.setEnabled(can_start)
         self.btn_stop.setEnabled(can_stop)
         self.btn_restart.setEnabled(can_restart and status != "stopping")
         self.btn_edit.setEnabled(True)
-        self.btn_del.setEnabled(status in ("stopped", "crashed") or (not self._client_mode))
+        self.btn_del.setEnabled(status in IDLE_STATUSES or (not self._client_mode))
 
-        can_start_enabled = any((pr.status or "").strip().lower() in ("stopped", "crashed") and pr.enabled for pr in self.projects)
-        can_stop_all = any((pr.status or "").strip().lower() in ("running", "starting", "stopping", "waiting") for pr in self.projects)
+        can_start_enabled = any(pr.status_norm in IDLE_STATUSES and pr.enabled for pr in self.projects)
+        can_stop_all = any(pr.status_norm in ACTIVE_STATUSES for pr in self.projects)
         self.btn_start_enabled.setEnabled(can_start_enabled)
         self.btn_stop_all.setEnabled(can_stop_all)
 
 
     def _update_row_status(self, p: Project):
         if p.item:
-            p.item.setText(2, self._status_label(p.status))
             p.item.setData(2, Qt.ItemDataRole.UserRole, p.status)
-            self._apply_status_style(p)
-            self.tree.viewport().update()
-        if p.log:
-            idx = self.tabs.indexOf(p.log)
-            if idx >= 0:
-                self.tabs.setTabText(idx, p.name)
+        # setTabText всегда пересчитывает раскладку таббара, даже с тем же текстом
+        if p.tab_index >= 0 and self.tabs.tabText(p.tab_index) != p.name:
+            self.tabs.setTabText(p.tab_index, p.name)
         self._apply_tab_status(p)
         if not self._client_mode:
             write_state(self.projects)
         self._refresh_action_buttons()
 
+    def _set_status(self, p: Project, status: str) -> None:
+        if p.status == status:
+            return
+        p.set_status(status)
+        self._update_row_status(p)
+
     def _set_pending_action(self, p: Project, action: str) -> None:
         self._pending_actions[p.pid] = (action, time.monotonic())
 
@@ -2433,16 +3407,16 @@ class MainWindow(QtWidgets.QMainWindow):
         if (time.monotonic() - ts) > PENDING_STATUS_GRACE_SEC:
             self._pending_actions.pop(p.pid, None)
             return False
-        status = (new_status or "").strip().lower()
+        status = norm_status(new_status)
         if action == "start":
-            if status in ("stopped", "crashed", "stopping"):
+            if status in IDLE_STATUSES or status == "stopping":
                 return True
             if status == "running":
                 self._pending_actions.pop(p.pid, None)
         elif action == "stop":
-            if status in ("running", "starting", "stopping", "waiting"):
+            if status in ACTIVE_STATUSES:
                 return True
-            if status in ("stopped", "crashed"):
+            if status in IDLE_STATUSES:
                 self._pending_actions.pop(p.pid, None)
         elif action == "restart":
             if status == "running":
@@ -2455,13 +3429,22 @@ class MainWindow(QtWidgets.QMainWindow):
         return False
 
     # ---------- кнопки ----------
-    def on_add(self):
-        dlg = ProjectDialog(
-            self,
-            lang=self._language,
-            autostart_run=bool(self.cfg.data.get("autostart_run", False)),
-            autostart_task=bool(self.cfg.data.get("autostart_task", False)),
+    def _project_dialog(self, init: Optional[dict] = None) -> ProjectDialog:
+        # один экземпляр на окно: виджеты и раскладка строятся при первом открытии
+        args = (
+            init,
+            self._language,
+            bool(self.cfg.data.get("autostart_run", False)),
+            bool(self.cfg.data.get("autostart_task", False)),
         )
+        if self._dlg_project is None:
+            self._dlg_project = ProjectDialog(self, *args)
+        else:
+            self._dlg_project.reset(*args)
+        return self._dlg_project
+
+    def on_add(self):
+        dlg = self._project_dialog()
         if dlg.exec() == QtWidgets.QDialog.Accepted:
             d = dlg.get_data()
             self._apply_app_autostart_settings(d)
@@ -2469,23 +3452,17 @@ class MainWindow(QtWidgets.QMainWindow):
             d.pop("app_autostart_task", None)
             p = Project(pid=uuid.uuid4().hex, **d)
             self.projects.append(p)
-            self.cfg.set_projects(self.projects)
-            self._populate_projects()
-            if self._client_mode:
-                self._send_command("reload")
+            self._append_project_row(p)
+            self.tree.setCurrentItem(p.item)
+            # как в on_delete: конфиг пишем после обновления окна, через отложенную запись
+            self._schedule_cfg_save(projects=True, reload=self._client_mode)
 
     def on_edit(self):
         p = self._selected_project()
         if not p:
             return
         init = p.to_dict()
-        dlg = ProjectDialog(
-            self,
-            init=init,
-            lang=self._language,
-            autostart_run=bool(self.cfg.data.get("autostart_run", False)),
-            autostart_task=bool(self.cfg.data.get("autostart_task", False)),
-        )
+        dlg = self._project_dialog(init)
         if dlg.exec() == QtWidgets.QDialog.Accepted:
             d = dlg.get_data()
             self._apply_app_autostart_settings(d)
@@ -2495,6 +3472,7 @@ class MainWindow(QtWidgets.QMainWindow):
             p.cmd = d["cmd"]
             p.cwd = d["cwd"]
             p.args = d.get("args", "")
+            p.args_parsed = None
             p.autorestart = d["autorestart"]
             p.enabled = d["enabled"]
             p.clear_log_on_start = bool(d.get("clear_log_on_start", False))
@@ -2502,33 +3480,57 @@ class MainWindow(QtWidgets.QMainWindow):
                 p.item.setText(1, p.name)
                 p.item.setText(3, p.cmd)
                 p.item.setText(4, p.cwd)
-            if p.log is not None:
-                idx = self.tabs.indexOf(p.log)
-                if idx >= 0:
-                    self.tabs.setTabText(idx, p.name)
+            if p.tab_index >= 0:
+                self.tabs.setTabText(p.tab_index, p.name)
             if p.switch is not None:
-                p.switch.blockSignals(True)
-                p.switch.setChecked(p.enabled)
-                p.switch.blockSignals(False)
-            self.cfg.set_projects(self.projects)
-            if self._client_mode:
-                self._send_command("reload")
+                with QtCore.QSignalBlocker(p.switch):
+                    p.switch.setChecked(p.enabled)
+            self._schedule_cfg_save(projects=True, reload=self._client_mode)
 
     def on_delete(self):
         p = self._selected_project()
         if not p:
             return
         if (p.process and p.process.state() == QtCore.QProcess.Running) or (
-            self._client_mode and (p.status or "").strip().lower() in ("running", "starting")
+            self._client_mode and p.status_norm in ("running", "starting")
         ):
             QtWidgets.QMessageBox.warning(
                 self, APP_NAME, self._tr("msg_stop_running"))
             return
-        self.projects = [x for x in self.projects if x.pid != p.pid]
-        self.cfg.set_projects(self.projects)
-        self._populate_projects()
-        if self._client_mode:
-            self._send_command("reload")
+        # строка, вкладка и позиция в списке совпадают — это p.tab_index
+        idx = p.tab_index
+        if idx < 0:
+            return
+        del self.projects[idx]
+        self._remove_project_widgets(p, idx)
+        # сначала приводим окно в порядок, потом пишем конфиг: сбой записи (файл занят)
+        # не рассинхронизирует список, вкладки и индексы, а отложенная запись повторится
+        self._schedule_cfg_save(projects=True, reload=self._client_mode)
+
+    def _remove_project_widgets(self, p: Project, idx: int) -> None:
+        # точечно убираем строку и вкладку, не пересоздавая остальные виджеты
+        page = self.tabs.widget(p.tab_index) if p.tab_index >= 0 else None
+        with QtCore.QSignalBlocker(self.tree), QtCore.QSignalBlocker(self.tabs):
+            self.tree.takeTopLevelItem(idx)
+            if p.tab_index >= 0:
+                self.tabs.removeTab(p.tab_index)
+        if page is not None:
+            page.deleteLater()
+        for q in self.projects:
+            if q.tab_index > p.tab_index >= 0:
+                q.tab_index -= 1
+        for cache in (self._tab_colors, self._log_offsets, self._dirty_output, self._pid_index):
+            cache.pop(p.pid, None)
+        p.item = None
+        p.switch = None
+        p.log = None
+        p.tab_index = -1
+        if self.projects:
+            cur = min(idx, len(self.projects) - 1)
+            with QtCore.QSignalBlocker(self.tree), QtCore.QSignalBlocker(self.tabs):
+                self.tree.setCurrentItem(self.projects[cur].item)
+                self.tabs.setCurrentIndex(cur)
+        self._refresh_action_buttons()
 
     def on_start_selected(self):
         p = self._selected_project()
@@ -2537,8 +3539,7 @@ class MainWindow(QtWidgets.QMainWindow):
         if self._client_mode:
             if p.clear_log_on_start:
                 self._clear_log_for_project(p)
-            p.status = "starting"
-            self._update_row_status(p)
+            self._set_status(p, "starting")
             self._set_pending_action(p, "start")
             self._send_command("start", p.pid)
             return
@@ -2549,8 +3550,7 @@ class MainWindow(QtWidgets.QMainWindow):
         if not p:
             return
         if self._client_mode:
-            p.status = "stopping"
-            self._update_row_status(p)
+            self._set_status(p, "stopping")
             self._set_pending_action(p, "stop")
             self._send_command("stop", p.pid)
             return
@@ -2563,12 +3563,8 @@ class MainWindow(QtWidgets.QMainWindow):
         if self._client_mode:
             if p.clear_log_on_start:
                 self._clear_log_for_project(p)
-            cur_status = (p.status or "").strip().lower()
-            if cur_status in ("running", "starting", "stopping", "waiting"):
-                p.status = "stopping"
-            else:
-                p.status = "starting"
-            self._update_row_status(p)
+            self._set_status(
+                p, "stopping" if p.status_norm in ACTIVE_STATUSES else "starting")
             self._set_pending_action(p, "restart")
             self._send_command("restart", p.pid)
             return
@@ -2578,39 +3574,83 @@ class MainWindow(QtWidgets.QMainWindow):
         self.start_project(p)
 
     def on_start_enabled(self):
+        if self._closing:
+            # «Запустить включённые» из трея во вложенном цикле closeEvent
+            return
         if self._client_mode:
-            for p in self.projects:
-                if p.enabled and (p.status or "").strip().lower() in ("stopped", "crashed"):
-                    if p.clear_log_on_start:
-                        self._clear_log_for_project(p)
-                    p.status = "starting"
-                    self._update_row_status(p)
-                    self._set_pending_action(p, "start")
+            self.tree.setUpdatesEnabled(False)
+            try:
+                for p in self.projects:
+                    if p.enabled and p.status_norm in IDLE_STATUSES:
+                        if p.clear_log_on_start:
+                            self._clear_log_for_project(p)
+                        self._set_status(p, "starting")
+                        self._set_pending_action(p, "start")
+            finally:
+                # setUpdatesEnabled(True) сам планирует перерисовку
+                self.tree.setUpdatesEnabled(True)
             self._send_command("start_enabled")
             return
+        if self._bulk_start_targets:
+            return  # предыдущий пакет ещё готовится
         targets = [p for p in self.projects if p.enabled and not (
-            p.process and p.process.state() == QtCore.QProcess.Running)]
+            p.process and p.process.state() != QtCore.QProcess.NotRunning)]
         if not targets:
             QtWidgets.QMessageBox.information(
                 self, APP_NAME, self._tr("msg_no_enabled"))
             return
-        self._start_enabled_queue = targets[:]
-        self._start_enabled_next()
+        # Поиск/зачистка зомби (снимок процессов, командные строки, taskkill) —
+        # в пуле потоков, чтобы окно не подвисало; сами QProcess стартуем в GUI-потоке.
+        # как в start_project: если уже бежит соседний проект с той же командой/папкой,
+        # зачистка по подстрокам задела бы его детей — такой проект не зачищаем
+        exclude: set[int] = set()
+        sweep = []
+        for p in targets:
+            if not p.cmd:
+                continue
+            exclude, conflict = _running_pids_and_conflict(self.projects, p)
+            if not conflict:
+                sweep.append((p.cmd, p.cwd))
+        self._bulk_start_targets = targets
+        self.tree.setUpdatesEnabled(False)
+        try:
+            for p in targets:
+                if p.cmd:
+                    self._set_status(p, "starting")
+        finally:
+            self.tree.setUpdatesEnabled(True)
 
-    def _start_enabled_next(self):
-        if not self._start_enabled_queue:
-            return
-        p = self._start_enabled_queue.pop(0)
-        self.start_project(p)
-        QtCore.QTimer.singleShot(250, self._start_enabled_next)
+        def _sweep():
+            with _win_process_batch():
+                for cmd, cwd in sweep:
+                    _win_kill_project_zombies(cmd, cwd, exclude)
+            self._bulk_start_signals.swept.emit()
+
+        self._thread_pool.start(_sweep)
+
+    def _on_bulk_sweep_done(self) -> None:
+        targets, self._bulk_start_targets = self._bulk_start_targets, []
+        # QProcess.start() асинхронный — стартуем все сразу, без искусственных пауз
+        self.tree.setUpdatesEnabled(False)
+        try:
+            for p in targets:
+                # пока шла зачистка, проект могли остановить или запустить вручную
+                if p.cmd and (p.status_norm != "starting" or p.process is not None):
+                    continue
+                self.start_project(p, sweep_zombies=False)
+        finally:
+            self.tree.setUpdatesEnabled(True)
 
     def on_stop_all(self):
         if self._client_mode:
-            for p in self.projects:
-                if (p.status or "").strip().lower() in ("running", "starting", "stopping"):
-                    p.status = "stopping"
-                    self._update_row_status(p)
-                    self._set_pending_action(p, "stop")
+            self.tree.setUpdatesEnabled(False)
+            try:
+                for p in self.projects:
+                    if p.status_norm in ("running", "starting", "stopping"):
+                        self._set_status(p, "stopping")
+                        self._set_pending_action(p, "stop")
+            finally:
+                self.tree.setUpdatesEnabled(True)
             self._send_command("stop_all")
             return
         for p in self.projects:
@@ -2627,21 +3667,16 @@ class MainWindow(QtWidgets.QMainWindow):
     # ---------- автозапуск ----------
     def on_toggle_autostart(self, enabled: bool):
         self.cfg.data["autostart_run"] = enabled
-        self.cfg.save()
+        self._schedule_cfg_save()
         set_windows_run_autostart(enabled)
 
     def _set_autostart_task_checked(self, value: bool):
         if getattr(self, "act_autostart_task", None) is None:
             return
-        self._syncing_autostart_task = True
-        try:
+        with QtCore.QSignalBlocker(self.act_autostart_task):
             self.act_autostart_task.setChecked(value)
-        finally:
-            self._syncing_autostart_task = False
 
     def on_toggle_autostart_task(self, enabled: bool):
-        if self._syncing_autostart_task:
-            return
         if enabled:
             user = get_windows_username()
             if not user:
@@ -2668,7 +3703,7 @@ class MainWindow(QtWidgets.QMainWindow):
                 self._set_autostart_task_checked(False)
                 return
             self.cfg.data["autostart_task"] = True
-            self.cfg.save()
+            self._schedule_cfg_save()
         else:
             ok_task, err = set_windows_task_autostart(False)
             if not ok_task:
@@ -2677,7 +3712,7 @@ class MainWindow(QtWidgets.QMainWindow):
                 self._set_autostart_task_checked(True)
                 return
             self.cfg.data["autostart_task"] = False
-            self.cfg.save()
+            self._schedule_cfg_save()
 
     # ---------- about ----------
     def on_about(self):
@@ -2691,7 +3726,10 @@ class MainWindow(QtWidgets.QMainWindow):
 
     # ---------- запуск/стоп процессов ----------
 
-    def start_project(self, p: Project):
+    def start_project(self, p: Project, *, sweep_zombies: bool = True):
+        if self._closing:
+            # отложенный автоперезапуск может сработать во вложенном цикле closeEvent
+            return
         if p.process and p.process.state() == QtCore.QProcess.Running:
             return
         if not p.cmd:
@@ -2700,216 +3738,327 @@ class MainWindow(QtWidgets.QMainWindow):
             return
 
         # санитарная очистка зомби перед запуском (бережно)
-        # соберём PID-ы текущих запущенных проектов, чтобы их не трогать
-        exclude = set()
-        for q in self.projects:
-            if q.process and q.process.state() == QtCore.QProcess.Running:
-                try:
-                    exclude.add(int(q.process.processId()))
-                except Exception:
-                    pass
+        # соберём PID-ы текущих запущенных проектов, чтобы их не трогать;
         # если уже бежит проект с той же командой или той же рабочей папкой — зачистку пропускаем
-        conflict_running = any((q is not p) and q.process and q.process.state() == QtCore.QProcess.Running and (
-            q.cmd == p.cmd or (p.cwd and q.cwd and q.cwd == p.cwd)) for q in self.projects)
-        if not conflict_running:
-            _win_kill_project_zombies(p.cmd, p.cwd, exclude)
+        if sweep_zombies:
+            exclude, conflict_running = _running_pids_and_conflict(self.projects, p)
+            if not conflict_running:
+                _win_kill_project_zombies(p.cmd, p.cwd, exclude)
         if p.clear_log_on_start:
             self._clear_log_for_project(p)
         p.waiting_network = False
         program, args = program_and_args_for_cmd(p.cmd)
         # Добавим пользовательские параметры запуска
-        extra = (p.args or '').strip()
-        if extra:
-            try:
-                args += shlex.split(extra, posix=False)
-            except Exception:
-                args += extra.split()
+        args += p.extra_args()
         proc = QtCore.QProcess(self)
-        env = QtCore.QProcessEnvironment.systemEnvironment()
-        env.insert("PYTHONIOENCODING", "utf-8")
-        env.insert("COMBINER", "1")
-        proc.setProcessEnvironment(env)
+        proc.setProcessEnvironment(self._proc_env_template)
         proc.setProgram(program)
         proc.setArguments(args)
         if p.cwd:
             proc.setWorkingDirectory(p.cwd)
         proc.setProcessChannelMode(QtCore.QProcess.MergedChannels)
 
-        proc.readyReadStandardOutput.connect(
-            lambda p_=p, pr=proc: self._on_proc_output(p_, pr))
-        proc.readyReadStandardError.connect(
-            lambda p_=p, pr=proc: self._on_proc_output(p_, pr))
-        proc.finished.connect(lambda code, status,
-                              p_=p, pr=proc: self._on_proc_finished(p_, pr, code, status))
-        proc.errorOccurred.connect(
-            lambda err, p_=p, pr=proc: self._on_proc_error(p_, pr, err))
-        proc.started.connect(lambda p_=p: self._on_proc_started(p_))
+        on_output = functools.partial(self._on_proc_output, p, proc)
+        proc.readyReadStandardOutput.connect(on_output)
+        proc.readyReadStandardError.connect(on_output)
+        proc.finished.connect(functools.partial(self._on_proc_finished, p, proc))
+        proc.errorOccurred.connect(functools.partial(self._on_proc_error, p, proc))
+        proc.started.connect(functools.partial(self._on_proc_started, p))
 
         p.stopping = False
-        p.status = "starting"
-        self._update_row_status(p)
+        self._set_status(p, "starting")
         try:
             proc.start()
         except Exception as e:
-            if p.log:
+            if self._ensure_log(p):
                 p.log.append_text(self._tr("log_start_error", err=e) + "\n")
-            append_project_log(p, self._tr("log_start_error", err=e) + "\n")
-            p.status = "stopped"
-            self._update_row_status(p)
+            self._append_log_file(p, self._tr("log_start_error", err=e) + "\n")
+            self._set_status(p, "stopped")
             return
 
         p.process = proc
-        if p.log:
-            p.log.append_text(
-                f"[{QtCore.QDateTime.currentDateTime().toString('yyyy-MM-dd hh:mm:ss')}] "
-                f"{self._tr('log_start', cmd=p.cmd)}\n")
-        append_project_log(
-            p,
-            f"[{QtCore.QDateTime.currentDateTime().toString('yyyy-MM-dd hh:mm:ss')}] "
-            f"{self._tr('log_start', cmd=p.cmd)}\n",
-        )
+        line = f"[{_ts()}] {self._tr('log_start', cmd=p.cmd)}\n"
+        if self._ensure_log(p):
+            p.log.append_text(line)
+        self._append_log_file(p, line)
 
     def _on_proc_started(self, p: Project):
-        p.status = "running"
-        self._update_row_status(p)
+        if p.process is not None:
+            p.os_pid = int(p.process.processId() or 0) or None
+            _win_job_close(p.job_handle)
+            p.job_handle = _win_job_for_pid(p.os_pid or 0)
+        self._set_status(p, "running")
 
     def stop_project(self, p: Project):
         # мягко → жёстко → зачистка зомби
         p.waiting_network = False
         if p.process and p.process.state() == QtCore.QProcess.Running:
             p.stopping = True
-            p.status = "stopping"
-            self._update_row_status(p)
+            self._set_status(p, "stopping")
             pid = int(p.process.processId() or 0)
             try:
                 p.process.terminate()
                 if not p.process.waitForFinished(1500):
-                    _win_taskkill_tree(pid)
+                    _win_kill_tree(pid, p.job_handle)
             except Exception:
-                _win_taskkill_tree(pid)
+                _win_kill_tree(pid, p.job_handle)
         else:
             _win_kill_project_zombies(p.cmd, p.cwd)
-            p.status = "stopped"
-            self._update_row_status(p)
+            self._set_status(p, "stopped")
+        self._log_stopped(p)
+
+    def _log_stopped(self, p: Project) -> None:
+        self._flush_output(p)
+        line = f"[{_ts()}] {self._tr('log_stop')}\n"
+        # без открытой вкладки не создаём LogView ради одной строки (например, при выходе)
         if p.log:
-            p.log.append_text(
-                f"[{QtCore.QDateTime.currentDateTime().toString('yyyy-MM-dd hh:mm:ss')}] "
-                f"{self._tr('log_stop')}\n"
-            )
-        append_project_log(
-            p,
-            f"[{QtCore.QDateTime.currentDateTime().toString('yyyy-MM-dd hh:mm:ss')}] "
-            f"{self._tr('log_stop')}\n",
-        )
+            p.log.append_text(line)
+        self._append_log_file(p, line)
+
+    @staticmethod
+    def _wait_processes(procs: List[QtCore.QProcess], timeout_ms: int) -> None:
+        """
+        Ждёт завершения всех procs по сигналам finished во вложенном цикле
+        событий — ожидания идут параллельно, потолок общий timeout_ms.
+        """
+        pending = [pr for pr in procs if pr.state() != QtCore.QProcess.NotRunning]
+        if not pending:
+            return
+        loop = QtCore.QEventLoop()
+
+        def check(*_):
+            if all(pr.state() == QtCore.QProcess.NotRunning for pr in pending):
+                loop.quit()
+
+        for pr in pending:
+            pr.finished.connect(check)
+        timer = QtCore.QTimer()
+        timer.setSingleShot(True)
+        timer.timeout.connect(loop.quit)
+        timer.start(timeout_ms)
+        loop.exec()
+        timer.stop()
+        for pr in pending:
+            try:
+                pr.finished.disconnect(check)
+            except Exception:
+                pass
 
     def _on_proc_output(self, p: Project, pr: QtCore.QProcess):
-        data = pr.readAll().data()
-        text = decode_bytes(data)
-        if p.log and text:
+        data = pr.read(PROC_READ_CHUNK).data()
+        if data:
+            p.out_buf += data
+            self._dirty_output[p.pid] = p
+            if not self._output_timer.isActive():
+                self._output_timer.start()
+        if pr.bytesAvailable() > 0:
+            # даём GUI перерисоваться, остаток дочитаем позже
+            QtCore.QTimer.singleShot(
+                0, functools.partial(self._on_proc_output, p, pr))
+
+    def _flush_output(self, p: Project, final: bool = False) -> None:
+        self._dirty_output.pop(p.pid, None)
+        # дети получают PYTHONIOENCODING=utf-8 — обычно строгий UTF-8 проходит сразу
+        text = decode_stream(p.out_buf, final)
+        if text and self._ensure_log(p):
             p.log.append_text(text)
         if text:
-            append_project_log(p, text)
+            self._append_log_file(p, text)
+
+    def _flush_all_output(self) -> None:
+        for p in list(self._dirty_output.values()):
+            self._flush_output(p)
 
     def _on_proc_finished(self, p: Project, pr: QtCore.QProcess, code: int, status: QtCore.QProcess.ExitStatus):
-        if p.log:
-            p.log.append_text(
-                f"[{QtCore.QDateTime.currentDateTime().toString('yyyy-MM-dd hh:mm:ss')}] "
-                f"{self._tr('log_finish', code=code, status=('CrashExit' if status==QtCore.QProcess.CrashExit else 'NormalExit'))}\n"
-            )
-        append_project_log(
-            p,
-            f"[{QtCore.QDateTime.currentDateTime().toString('yyyy-MM-dd hh:mm:ss')}] "
-            f"{self._tr('log_finish', code=code, status=('CrashExit' if status==QtCore.QProcess.CrashExit else 'NormalExit'))}\n",
+        # отложенные дочитывания _on_proc_output могут не успеть до finished —
+        # забираем остаток сейчас, чтобы он лёг до строки о завершении
+        p.out_buf += pr.readAll().data()
+        self._flush_output(p, final=True)
+        line = (
+            f"[{_ts()}] "
+            f"{self._tr('log_finish', code=code, status=('CrashExit' if status==QtCore.QProcess.CrashExit else 'NormalExit'))}\n"
         )
+        if self._ensure_log(p):
+            p.log.append_text(line)
+        self._append_log_file(p, line)
         if p.process is not pr:
             return
         was_stopping = p.stopping
-        p.status = "stopped" if (was_stopping or (status == QtCore.QProcess.NormalExit and code == 0)) else "crashed"
-        self._update_row_status(p)
+        self._set_status(p, "stopped" if (was_stopping or (status == QtCore.QProcess.NormalExit and code == 0)) else "crashed")
 
         pr_autorestart = (
             p.autorestart and not was_stopping and status == QtCore.QProcess.CrashExit)
         p.process = None
+        p.os_pid = None
+        _win_job_close(p.job_handle)
+        p.job_handle = None
         if p.stopping:
             p.stopping = False
 
         if pr_autorestart:
-            QtCore.QTimer.singleShot(2000, lambda: self.start_project(p))
+            QtCore.QTimer.singleShot(2000, functools.partial(self.start_project, p))
 
     def _on_proc_error(self, p: Project, pr: QtCore.QProcess, err: QtCore.QProcess.ProcessError):
         if p.process is not pr:
             return
-        if p.log:
+        self._flush_output(p)
+        if self._ensure_log(p):
             p.log.append_text(self._tr("log_proc_error", err=err) + "\n")
-        append_project_log(p, self._tr("log_proc_error", err=err) + "\n")
+        self._append_log_file(p, self._tr("log_proc_error", err=err) + "\n")
 
     def _on_selection_changed(self):
-        if self._syncing_selection:
+        if not self.tree.currentItem():
             return
+        self._refresh_action_buttons()
+        # вкладку переключаем в конце итерации цикла событий: серия смен выделения
+        # (стрелки, клавиатурный поиск) даёт одну смену вкладки, а не по LogView на шаг
+        if not self._tab_sync_queued:
+            self._tab_sync_queued = True
+            QtCore.QTimer.singleShot(0, self._sync_tab_to_selection)
+
+    def _sync_tab_to_selection(self):
+        self._tab_sync_queued = False
         it = self.tree.currentItem()
         if not it:
             return
         pid = it.data(0, Qt.ItemDataRole.UserRole)
-        # активировать вкладку по имени
-        for idx, prj in enumerate(self.projects):
-            if prj.pid == pid:
-                self._syncing_selection = True
-                try:
-                    self.tabs.setCurrentIndex(idx)
-                finally:
-                    self._syncing_selection = False
-                break
-        self._refresh_action_buttons()
+        # активировать вкладку проекта
+        p = self._pid_index.get(pid)
+        if p is None or p.tab_index < 0:
+            return
+        if p.tab_index != self.tabs.currentIndex():
+            with QtCore.QSignalBlocker(self.tabs):
+                self.tabs.setCurrentIndex(p.tab_index)
+        self._ensure_log(p)
 
     def _on_tab_changed(self, index: int):
-        if self._syncing_selection:
-            return
         if index < 0 or index >= len(self.projects):
             return
         prj = self.projects[index]
         if not prj.item:
             return
-        self._syncing_selection = True
-        try:
+        with QtCore.QSignalBlocker(self.tree):
             self.tree.setCurrentItem(prj.item)
-        finally:
-            self._syncing_selection = False
-        if self._client_mode:
+        fresh = prj.log is None
+        self._ensure_log(prj)
+        if self._client_mode and not fresh:
             self._load_log_tail(prj)
 
     def closeEvent(self, event: QtGui.QCloseEvent) -> None:
         # Реальный выход по крестику
+        if self._closing:
+            # повторный крестик, пока ждём детей во вложенном цикле событий
+            event.ignore()
+            return
+        self._closing = True
+        self._cfg_save_pending = False
+        self._cfg_projects_dirty = False
         try:
-            self.cfg.set_projects(self.projects)
+            self.cfg.data["window_geometry"] = bytes(self.saveGeometry().toBase64()).decode("ascii")
         except Exception:
-            traceback.print_exc()
+            pass
+        if self._client_mode:
+            try:
+                self.cfg.set_projects(self.projects)
+            except Exception as e:
+                log_app(f"Config save on exit failed: {e!r}")
+            # reload только после записи — демон должен прочитать свежий файл
+            if self._cfg_reload_pending:
+                self._cfg_reload_pending = False
+                self._send_command("reload")
+        else:
+            # снимок берём здесь, а пишем в пуле — запись идёт, пока гасим детей
+            self.cfg.data["projects"] = [p.to_dict() for p in self.projects]
+            payload = self.cfg.dump()  # сериализуем в GUI-потоке: пулу — только готовый текст
+            self._thread_pool.start(lambda: self._save_config_on_exit(payload))
         if not self._client_mode:
-            # Остановка всех процессов
-            for p in self.projects:
+            # пакет, ожидающий зачистки зомби, уже не запускаем
+            self._bulk_start_targets = []
+            # Мягкая остановка: terminate всем сразу, а не terminate+ожидание по очереди
+            running = [
+                p for p in self.projects
+                if p.process and p.process.state() == QtCore.QProcess.Running]
+            for p in running:
+                p.waiting_network = False
+                p.stopping = True
+                self._set_status(p, "stopping")
                 try:
-                    self.stop_project(p)
+                    p.process.terminate()
                 except Exception:
                     pass
-            QtWidgets.QApplication.processEvents(QtCore.QEventLoop.AllEvents, 50)
-            for p in self.projects:
+            # у остальных только зачистка зомби — её гоним в пуле, пока ждём детей;
+            # статус и строку лога пишем здесь, в GUI-потоке
+            running_ids = {id(p) for p in running}
+            idle = [p for p in self.projects if id(p) not in running_ids]
+            for p in idle:
+                p.waiting_network = False
+                self._set_status(p, "stopped")
+                self._log_stopped(p)
+            targets = [(p.cmd, p.cwd) for p in idle]
+
+            def _sweep():
+                with _win_process_batch():
+                    for cmd, cwd in targets:
+                        _win_kill_project_zombies(cmd, cwd)
+
+            if targets:
+                self._thread_pool.start(_sweep)
+            self._wait_processes([p.process for p in running], 2000)
+            for p in running:
+                # завершившиеся дочитаны в _on_proc_finished; у живых забираем буфер сейчас
+                if p.process:
+                    p.out_buf += p.process.readAll().data()
+                    self._dirty_output[p.pid] = p
+            self._flush_all_output()
+            # выживших добиваем разом: задания — TerminateJobObject, остальные —
+            # одним taskkill на все PID; потом одно общее ожидание, а не 800 мс на каждого
+            survivors = [
+                p for p in self.projects
+                if p.process and p.process.state() == QtCore.QProcess.Running]
+            orphan_pids = []
+            for p in survivors:
                 try:
-                    if p.process and p.process.state() == QtCore.QProcess.Running:
-                        pid = int(p.process.processId() or 0)
-                        _win_taskkill_tree(pid)
-                        p.process.waitForFinished(800)
-                    p.log = None
+                    if not _win_job_terminate(p.job_handle):
+                        orphan_pids.append(int(p.process.processId() or 0))
                 except Exception:
                     pass
+            _win_taskkill_tree_many(orphan_pids)
+            self._wait_processes([p.process for p in survivors], 800)
+            for p in running:
+                self._log_stopped(p)
+            for p in self.projects:
+                p.log = None
+            self._thread_pool.waitForDone(2000)
+        self._log_writer.stop()
         super().closeEvent(event)
 
+    def _save_config_on_exit(self, payload: str) -> None:
+        try:
+            self.cfg.write(payload)
+        except Exception as e:
+            log_app(f"Config save on exit failed: {e!r}")
+
+    def _restore_geometry(self) -> bool:
+        geom = self.cfg.data.get("window_geometry")
+        if not isinstance(geom, str) or not geom:
+            return False
+        try:
+            return bool(self.restoreGeometry(
+                QtCore.QByteArray.fromBase64(geom.encode("ascii"))))
+        except Exception:
+            return False
+
     def showEvent(self, e: QtGui.QShowEvent) -> None:
         super().showEvent(e)
-        if not getattr(self, "_centered_once", False):
+        if not self._centered_once:
             self._centered_once = True
             screen = self.screen() or QtWidgets.QApplication.primaryScreen()
             geo = self.frameGeometry()
             geo.moveCenter(screen.availableGeometry().center())
             self.move(geo.topLeft())
+        if not self._started_once:
+            self._started_once = True
+            QtCore.QTimer.singleShot(0, self.on_start_enabled)
 
     def _build_tray(self):
         self.tray = QtWidgets.QSystemTrayIcon(self)
@@ -2917,8 +4066,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.tray.setIcon(icon)
         menu = QtWidgets.QMenu()
         self.act_tray_show = menu.addAction("")
-        self.act_tray_show.triggered.connect(
-            lambda: (self.showNormal(), self.raise_(), self.activateWindow()))
+        self.act_tray_show.triggered.connect(self._show_from_tray)
         menu.addSeparator()
         self.act_tray_start_enabled = menu.addAction("")
         self.act_tray_start_enabled.triggered.connect(self.on_start_enabled)
@@ -2929,32 +4077,86 @@ class MainWindow(QtWidgets.QMainWindow):
         self.tray.activated.connect(self._on_tray_activated)
         self.tray.show()
 
+    def _apply_tray_texts(self) -> None:
+        if not self.tray or self._tray_strings is self._strings:
+            return
+        self._tray_strings = self._strings
+        self.act_tray_show.setText(self._tr("tray_show"))
+        self.act_tray_start_enabled.setText(self._tr("tray_start_enabled"))
+        self.act_tray_exit.setText(self._tr("tray_exit"))
+
+    def _deferred_icon(self) -> None:
+        # Иконка окна не нужна для первого кадра — ставим после показа.
+        self.setWindowIcon(load_app_icon())
+
+    def _ensure_tray(self) -> QtWidgets.QSystemTrayIcon:
+        # Трей (меню, действия, иконка) строим только при первом сворачивании.
+        if self.tray is None:
+            self._build_tray()
+            self._apply_tray_texts()
+        return self.tray
+
+    def _show_from_tray(self):
+        self.showNormal()
+        self.raise_()
+        self.activateWindow()
+
     def _on_tray_activated(self, reason):
         if reason == QtWidgets.QSystemTrayIcon.Trigger:
-            self.showNormal()
-            self.raise_()
-            self.activateWindow()
+            self._show_from_tray()
 
     def _quit_from_tray(self):
         self._really_quit = True
         self.close()
 
+    def _tray_is_available(self) -> bool:
+        # запоминаем только «да»: трей не исчезает, а появиться может (перезапуск Explorer)
+        if not self._tray_available:
+            self._tray_available = QtWidgets.QSystemTrayIcon.isSystemTrayAvailable()
+        return self._tray_available
+
     def changeEvent(self, event: QtCore.QEvent) -> None:
-        # Сворачивать в трей только при нажатии кнопки «Свернуть»
-        if event.type() == QtCore.QEvent.WindowStateChange:
-            if self.isMinimized() and QtWidgets.QSystemTrayIcon.isSystemTrayAvailable():
-                QtCore.QTimer.singleShot(0, self.hide)
+        if event.type() == QtCore.QEvent.ThemeChange:
+            # Windows сменила тему/акцент — перечитать реестр и перекрасить
+            invalidate_system_theme_cache()
+            QtCore.QTimer.singleShot(0, self.apply_theme)
+        # Сворачивать в трей только при нажатии кнопки «Свернуть»; при выходе — уже незачем
+        if (event.type() == QtCore.QEvent.WindowStateChange
+                and not (self._really_quit or self._closing)):
+            if self.isMinimized() and self._tray_is_available():
                 try:
-                    self.tray.showMessage(
-                        APP_NAME, self._tr("tray_minimized"), QtWidgets.QSystemTrayIcon.Information, 1200)
+                    tray = self._ensure_tray()
                 except Exception:
-                    pass
+                    tray = None  # без значка в трее не прячем окно — его не вернуть
+                if tray is not None:
+                    QtCore.QTimer.singleShot(0, self.hide)
+                    try:
+                        tray.showMessage(
+                            APP_NAME, self._tr("tray_minimized"), QtWidgets.QSystemTrayIcon.Information, 1200)
+                    except Exception:
+                        pass
         super().changeEvent(event)
 
 # ------------------------ Диалог проекта -----------------------------------
 
 
 class ProjectDialog(QtWidgets.QDialog):
+    """
+    Диалог проекта. Окно строится один раз и переиспользуется: reset()
+    заливает новые данные и при смене языка переводит подписи.
+    """
+
+    # значения полей для нового проекта; init перекрывает их
+    DEFAULTS = {
+        "name": "",
+        "cmd": "",
+        "cwd": "",
+        "args": "",
+        "enabled": False,
+        "autorestart": True,
+        "clear_log_on_start": False,
+    }
+
     def __init__(
         self,
         parent=None,
@@ -2964,9 +4166,8 @@ class ProjectDialog(QtWidgets.QDialog):
         autostart_task: Optional[bool] = None,
     ):
         super().__init__(parent)
-        self._lang = resolve_lang(lang)
-        self._tr = lambda key, **kwargs: tr(self._lang, key, **kwargs)
-        self.setWindowTitle(self._tr("dlg_title"))
+        self._lang = ""
+        self._strings: Dict[str, str] = {}
         self.setModal(True)
         lay = QtWidgets.QVBoxLayout(self)
         lay.setContentsMargins(12, 12, 12, 12)
@@ -2980,46 +4181,43 @@ class ProjectDialog(QtWidgets.QDialog):
         self.ed_cmd = QtWidgets.QLineEdit()
         self.ed_cwd = QtWidgets.QLineEdit()
         self.ed_args = QtWidgets.QLineEdit()
-        self.ed_args.setPlaceholderText(self._tr("dlg_placeholder_args"))
 
-        # авто-подстановка CWD/Имени из выбранного файла
-        self.ed_cmd.editingFinished.connect(self._autofill_from_cmd)
+        # авто-подстановка CWD/Имени из выбранного файла (подключается в reset)
+        self._autofill_connected = False
 
-        btn_cmd = QtWidgets.QPushButton(self._tr("dlg_browse"))
-        btn_cwd = QtWidgets.QPushButton(self._tr("dlg_browse"))
+        self.btn_cmd = QtWidgets.QPushButton()
+        self.btn_cwd = QtWidgets.QPushButton()
+        self.lbl_cmd = QtWidgets.QLabel()
+        self.lbl_cwd = QtWidgets.QLabel()
+        self.lbl_args = QtWidgets.QLabel()
+        self.lbl_name = QtWidgets.QLabel()
 
         row = QtWidgets.QHBoxLayout()
         row.addWidget(self.ed_cmd, 1)
-        row.addWidget(btn_cmd)
-        form.addRow(self._tr("dlg_label_cmd"), row)
+        row.addWidget(self.btn_cmd)
+        form.addRow(self.lbl_cmd, row)
 
         row2 = QtWidgets.QHBoxLayout()
         row2.addWidget(self.ed_cwd, 1)
-        row2.addWidget(btn_cwd)
-        form.addRow(self._tr("dlg_label_cwd"), row2)
-        form.addRow(self._tr("dlg_label_args"), self.ed_args)
+        row2.addWidget(self.btn_cwd)
+        form.addRow(self.lbl_cwd, row2)
+        form.addRow(self.lbl_args, self.ed_args)
 
-        form.addRow(self._tr("dlg_label_name"), self.ed_name)
+        form.addRow(self.lbl_name, self.ed_name)
 
-        self.chk_enabled = QtWidgets.QCheckBox(self._tr("dlg_chk_enabled"))
-        self.chk_autorst = QtWidgets.QCheckBox(self._tr("dlg_chk_autorst"))
-        self.chk_autorst.setChecked(True)
+        self.chk_enabled = QtWidgets.QCheckBox()
+        self.chk_autorst = QtWidgets.QCheckBox()
         lay.addWidget(self.chk_enabled)
         lay.addWidget(self.chk_autorst)
-        self.chk_clear_log = QtWidgets.QCheckBox(self._tr("dlg_chk_clear_log"))
+        self.chk_clear_log = QtWidgets.QCheckBox()
         lay.addWidget(self.chk_clear_log)
 
-        self.grp_autostart = QtWidgets.QGroupBox(
-            self._tr("dlg_app_autostart_group"))
+        self.grp_autostart = QtWidgets.QGroupBox()
         autol = QtWidgets.QVBoxLayout(self.grp_autostart)
         autol.setContentsMargins(10, 6, 10, 6)
         autol.setSpacing(4)
-        self.chk_app_autostart_run = QtWidgets.QCheckBox(
-            self._tr("dlg_app_autostart_run"))
-        self.chk_app_autostart_task = QtWidgets.QCheckBox(
-            self._tr("dlg_app_autostart_task"))
-        self.chk_app_autostart_task.setToolTip(
-            self._tr("dlg_app_autostart_task_tip"))
+        self.chk_app_autostart_run = QtWidgets.QCheckBox()
+        self.chk_app_autostart_task = QtWidgets.QCheckBox()
         autol.addWidget(self.chk_app_autostart_run)
         autol.addWidget(self.chk_app_autostart_task)
         lay.addWidget(self.grp_autostart)
@@ -3028,38 +4226,88 @@ class ProjectDialog(QtWidgets.QDialog):
             QtWidgets.QDialogButtonBox.Save | QtWidgets.QDialogButtonBox.Cancel)
         lay.addWidget(bb)
 
-        btn_cmd.clicked.connect(self._pick_cmd)
-        btn_cwd.clicked.connect(self._pick_cwd)
+        self.btn_cmd.clicked.connect(self._pick_cmd)
+        self.btn_cwd.clicked.connect(self._pick_cwd)
         bb.accepted.connect(self.accept)
         bb.rejected.connect(self.reject)
 
-        if init:
-            self.ed_name.setText(init.get("name", ""))
-            self.ed_cmd.setText(init.get("cmd", ""))
-            self.ed_cwd.setText(init.get("cwd", ""))
-            self.ed_args.setText(init.get("args", ""))
-            self.chk_enabled.setChecked(bool(init.get("enabled", False)))
-            self.chk_autorst.setChecked(bool(init.get("autorestart", True)))
-            self.chk_clear_log.setChecked(bool(init.get("clear_log_on_start", False)))
-        if autostart_run is not None:
-            self.chk_app_autostart_run.setChecked(bool(autostart_run))
-        if autostart_task is not None:
-            self.chk_app_autostart_task.setChecked(bool(autostart_task))
+        self.reset(init, lang, autostart_run, autostart_task)
+
+    def reset(
+        self,
+        init: Optional[dict] = None,
+        lang: str = Lang.System,
+        autostart_run: Optional[bool] = None,
+        autostart_task: Optional[bool] = None,
+    ) -> None:
+        """Подготовить уже построенный диалог к новому показу."""
+        self._retranslate(resolve_lang(lang))
+        d = {**self.DEFAULTS, **init} if init else self.DEFAULTS
+        self.ed_name.setText(d["name"])
+        self.ed_cmd.setText(d["cmd"])
+        self.ed_cwd.setText(d["cwd"])
+        self.ed_args.setText(d["args"])
+        self.chk_enabled.setChecked(bool(d["enabled"]))
+        self.chk_autorst.setChecked(bool(d["autorestart"]))
+        self.chk_clear_log.setChecked(bool(d["clear_log_on_start"]))
+        self.chk_app_autostart_run.setChecked(bool(autostart_run))
+        self.chk_app_autostart_task.setChecked(bool(autostart_task))
+        self._set_autofill(True)
+        self.ed_cmd.setFocus()
+
+    def _set_autofill(self, on: bool) -> None:
+        if on == self._autofill_connected:
+            return
+        self._autofill_connected = on
+        if on:
+            self.ed_cmd.editingFinished.connect(self._autofill_from_cmd)
+        else:
+            self.ed_cmd.editingFinished.disconnect(self._autofill_from_cmd)
+
+    def _retranslate(self, lang: str) -> None:
+        if lang == self._lang:
+            return
+        self._lang = lang
+        self._strings = _STRINGS_FLAT.get(lang, _STRINGS_FLAT[Lang.EN])
+        self.setWindowTitle(self._tr("dlg_title"))
+        self.ed_args.setPlaceholderText(self._tr("dlg_placeholder_args"))
+        self.btn_cmd.setText(self._tr("dlg_browse"))
+        self.btn_cwd.setText(self._tr("dlg_browse"))
+        self.lbl_cmd.setText(self._tr("dlg_label_cmd"))
+        self.lbl_cwd.setText(self._tr("dlg_label_cwd"))
+        self.lbl_args.setText(self._tr("dlg_label_args"))
+        self.lbl_name.setText(self._tr("dlg_label_name"))
+        self.chk_enabled.setText(self._tr("dlg_chk_enabled"))
+        self.chk_autorst.setText(self._tr("dlg_chk_autorst"))
+        self.chk_clear_log.setText(self._tr("dlg_chk_clear_log"))
+        self.grp_autostart.setTitle(self._tr("dlg_app_autostart_group"))
+        self.chk_app_autostart_run.setText(self._tr("dlg_app_autostart_run"))
+        self.chk_app_autostart_task.setText(self._tr("dlg_app_autostart_task"))
+        self.chk_app_autostart_task.setToolTip(self._tr("dlg_app_autostart_task_tip"))
+
+    def _tr(self, key: str, **kwargs) -> str:
+        text = self._strings.get(key, key)
+        return text.format(**kwargs) if kwargs else text
 
     def _autofill_from_cmd(self):
         path_str = self.ed_cmd.text().strip()
         if not path_str:
             return
+        need_cwd = not self.ed_cwd.text().strip()
+        need_name = not self.ed_name.text().strip()
         try:
-            p = Path(path_str)
-            # Рабочая папка = папка файла, если поле пустое
-            if not self.ed_cwd.text().strip():
-                self.ed_cwd.setText(str(p.parent))
-            # Имя проекта = имя родительской папки (если пусто), иначе имя файла без расширения
-            if not self.ed_name.text().strip():
-                self.ed_name.setText(p.parent.name or p.stem)
+            if need_cwd or need_name:
+                p = Path(path_str)
+                # Рабочая папка = папка файла, если поле пустое
+                if need_cwd:
+                    self.ed_cwd.setText(str(p.parent))
+                # Имя проекта = имя родительской папки (если пусто), иначе имя файла без расширения
+                if need_name:
+                    self.ed_name.setText(p.parent.name or p.stem)
         except Exception:
-            pass
+            return
+        # оба поля заполнены — до следующего открытия диалога на уход фокуса не реагируем
+        self._set_autofill(False)
 
     def _pick_cmd(self):
         path, _ = QtWidgets.QFileDialog.getOpenFileName(
@@ -3077,11 +4325,13 @@ class ProjectDialog(QtWidgets.QDialog):
             self.ed_cwd.setText(d)
 
     def get_data(self) -> dict:
+        name, cmd, cwd, args = map(str.strip, (
+            self.ed_name.text(), self.ed_cmd.text(), self.ed_cwd.text(), self.ed_args.text()))
         return {
-            "name": self.ed_name.text().strip() or self._tr("dlg_default_name"),
-            "cmd": self.ed_cmd.text().strip(),
-            "cwd": self.ed_cwd.text().strip(),
-            "args": self.ed_args.text().strip(),
+            "name": name or self._tr("dlg_default_name"),
+            "cmd": cmd,
+            "cwd": cwd,
+            "args": args,
             "enabled": self.chk_enabled.isChecked(),
             "autorestart": self.chk_autorst.isChecked(),
             "clear_log_on_start": self.chk_clear_log.isChecked(),
@@ -3092,7 +4342,8 @@ class ProjectDialog(QtWidgets.QDialog):
 
 # ------------------------ main ---------------------------------------------
 
-def main():
+def _parse_args_full(argv: List[str]):
+    import argparse
     parser = argparse.ArgumentParser()
     parser.add_argument("--autostart", action="store_true",
                         help="Запустить включённые проекты автоматически.")
@@ -3100,7 +4351,35 @@ def main():
                         help="Запуск без интерфейса (фоновый контроллер).")
     parser.add_argument("--data-dir", default="",
                         help="Переопределить папку данных PyCombiner.")
-    args = parser.parse_args()
+    return parser.parse_args(argv)
+
+
+def parse_args(argv: List[str]):
+    """
+    Наши три флага разбираем вручную — argparse при автозапуске не нужен.
+    --help, неизвестные и кривые аргументы уходят в argparse ради его справки и ошибок.
+    """
+    args = types.SimpleNamespace(autostart=False, headless=False, data_dir="")
+    it = iter(argv)
+    for a in it:
+        if a == "--autostart":
+            args.autostart = True
+        elif a == "--headless":
+            args.headless = True
+        elif a == "--data-dir":
+            value = next(it, None)
+            if value is None or value.startswith("-"):
+                return _parse_args_full(argv)
+            args.data_dir = value
+        elif a.startswith("--data-dir="):
+            args.data_dir = a.partition("=")[2]
+        else:
+            return _parse_args_full(argv)
+    return args
+
+
+def main():
+    args = parse_args(sys.argv[1:])
 
     if args.data_dir:
         set_data_dir(args.data_dir)
@@ -3122,6 +4401,8 @@ def main():
         controller = HeadlessController(cfg, autostart=args.autostart)
         # keep reference, otherwise GC may stop timers in headless mode
         app._headless_controller = controller  # type: ignore[attr-defined]
+        # aboutToQuit у контроллера останавливает проекты и убирает pid-файл
+        install_quit_signals(app, app.quit)
         sys.exit(app.exec())
 
     app = QtWidgets.QApplication(sys.argv)
@@ -3135,10 +4416,16 @@ def main():
         pass
 
     win = MainWindow(cfg)
-    win.resize(1200, 800)
     win.show()
     log_app("GUI started")
 
+    def _quit_gui():
+        # как «Выход» из трея: closeEvent сохранит конфиг и остановит детей
+        win._really_quit = True
+        win.close()
+
+    install_quit_signals(app, _quit_gui)
+
     sys.exit(app.exec())
 
 